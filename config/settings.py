@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,6 +32,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'tracker.middleware.QueryTimingMiddleware',
+    'tracker.middleware.PrimaryPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -43,7 +46,8 @@ ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that also reports render time to QueryTimingMiddleware
+        'BACKEND': 'tracker.timing.TimedDjangoTemplates',
         'DIRS': [
             BASE_DIR / 'tracker' / 'templates'
         ],
@@ -61,6 +65,13 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Requests slower than this are logged by tracker.middleware.QueryTimingMiddleware
+TRACKER_SLOW_REQUEST_MS = 500
+
+# Routes the sync versions of the note endpoints under /loadtest/sync/ so
+# loadtest_notes can compare them with the async ones on the same server
+TRACKER_LOADTEST_SYNC_VIEWS = os.environ.get('TRACKER_LOADTEST_SYNC_VIEWS') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -72,6 +83,83 @@ DATABASES = {
     }
 }
 
+# TRACKER_DB_PROFILE=production turns on WAL + tuned PRAGMAs (tracker.db)
+# and IMMEDIATE write transactions, so concurrent note edits queue on the
+# busy timeout instead of failing with "database is locked".
+# Measure with: python manage.py benchmark_sqlite
+#
+# Connections are not persistent by default: under ASGI (the production
+# deployment, needed for the live note streams) every request runs its sync
+# code in a thread of its own, so a kept-alive connection is never reused and
+# only lingers, and Django advises CONN_MAX_AGE = 0 in async mode. The cost is
+# a new connection and the PRAGMA hook per request (benchmark_sqlite shows it
+# as the "reconnect" row). A WSGI deployment, whose worker threads live on,
+# can set TRACKER_CONN_MAX_AGE=600 to skip that.
+
+DB_PROFILE = os.environ.get('TRACKER_DB_PROFILE', 'development')
+
+SQLITE_TUNING = DB_PROFILE == 'production'
+
+CONN_MAX_AGE = int(os.environ.get('TRACKER_CONN_MAX_AGE', 0))
+
+if SQLITE_TUNING:
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 5,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+
+    # Read-only views (tracker.routers.read_only) use a second connection,
+    # opened read-only over the same WAL file, so they never wait on the
+    # writer's connection. TRACKER_REPLICA_PATH can point it at a replicated
+    # copy of the database instead.
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{os.environ.get('TRACKER_REPLICA_PATH', DATABASES['default']['NAME'])}?mode=ro",
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 5},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['tracker.routers.ReadReplicaRouter']
+
+
+# Hot backups (python manage.py backup_db) are written here; keep this on a
+# different disk than db.sqlite3.
+
+BACKUP_DIR = Path(os.environ.get('TRACKER_BACKUP_DIR', BASE_DIR / 'backups'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is per process: set TRACKER_CACHE_DIR to share one file-based
+# cache between several worker processes so signal-driven invalidation
+# reaches all of them. MAX_ENTRIES leaves room for a cached row and a version
+# token per student (the default of 300 would evict them constantly).
+
+CACHE_MAX_ENTRIES = int(os.environ.get('TRACKER_CACHE_MAX_ENTRIES', 50000))
+
+if os.environ.get('TRACKER_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['TRACKER_CACHE_DIR'],
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'student-tracker',
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -1,5 +1,35 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db.models import Max, Min, Q
+from django.utils.functional import cached_property
 from .models import Class, Student, Enrollment, Note
+from . import search
+
+
+# ======================================================
+# 📄 ESTIMATED-COUNT PAGINATOR (large tables)
+# ======================================================
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs COUNT(*) over a whole big table.
+
+    Lists count at most COUNT_CAP rows, which is exact for anything smaller.
+    Past the cap, filtered or searched lists stop there, so the last pages of
+    a huge result are reached by narrowing the filter instead; an unfiltered
+    list is estimated from the ends of the primary key b-tree, MAX(pk) -
+    MIN(pk) + 1. That still overestimates by rows deleted between the two
+    ends, but not by the oldest rows taken out by archiving.
+    """
+    COUNT_CAP = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        capped = queryset[:self.COUNT_CAP].count()
+        if capped < self.COUNT_CAP or queryset.query.where:
+            return capped
+        ends = queryset.model._default_manager.aggregate(low=Min('pk'), high=Max('pk'))
+        return max(ends['high'] - ends['low'] + 1, capped)
 
 
 # ======================================================
@@ -35,8 +65,16 @@ class ClassAdmin(admin.ModelAdmin):
 @admin.register(Student)
 class StudentAdmin(admin.ModelAdmin):
     list_display = ('full_name', 'email', 'age', 'created_at')
-    search_fields = ('full_name', 'email')
+    search_fields = ('full_name', 'email', 'phone')
     inlines = [EnrollmentInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Use the FTS index instead of LIKE '%term%' scans."""
+        if not search_term:
+            return queryset, False
+        return queryset.filter(id__in=search.student_queryset(search_term).values('id')), False
 
 
 # ======================================================
@@ -46,7 +84,16 @@ class StudentAdmin(admin.ModelAdmin):
 class EnrollmentAdmin(admin.ModelAdmin):
     list_display = ('student', 'classroom', 'joined_at')
     search_fields = ('student__full_name', 'classroom__name')
+    # Class choices come from the small class table; filtering uses the
+    # (classroom, joined_at) index
     list_filter = ('classroom',)
+    list_select_related = ('student', 'classroom')
+    raw_id_fields = ('student',)
+    # Meta.ordering sorts through two joins; newest rows first is a rowid scan
+    ordering = ('-pk',)
+    sortable_by = ('joined_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [NoteInline]
 
 
@@ -61,4 +108,23 @@ class NoteAdmin(admin.ModelAdmin):
         'enrollment__classroom__name',
         'content',
     )
+    # Both filters hit an index: enrollment__classroom through the
+    # enrollment FK indexes, updated_at through (updated_at, id)
+    list_filter = ('enrollment__classroom', 'updated_at')
+    # str(enrollment) shows the student and the class
+    list_select_related = ('enrollment__student', 'enrollment__classroom')
+    raw_id_fields = ('enrollment',)
+    sortable_by = ('updated_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = ('created_at', 'updated_at')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match note content through FTS, student/class through their enrollments."""
+        if not search_term:
+            return queryset, False
+        matches = (
+            Q(id__in=search.note_queryset(search_term).values('id'))
+            | Q(enrollment__in=search.enrollment_queryset(search_term).values('id'))
+        )
+        return queryset.filter(matches), False
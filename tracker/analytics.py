@@ -0,0 +1,123 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import (
+    Class, ClassStatsSummary, ClassWeeklyStats, Enrollment, Note, RollupWatermark,
+)
+
+
+# ======================================================
+# 📊 CLASS ANALYTICS ROLLUPS
+# ======================================================
+# refresh_class_stats() finds the classes whose enrollments, notes or
+# counters changed since the stored watermark and recomputes their rollups,
+# one class per short transaction, so writers are never locked out for long.
+# Recomputing a class is idempotent, which lets consecutive runs overlap.
+
+WATERMARK_NAME = 'class_stats'
+TOP_STUDENTS = 5
+
+# Rows stamped just before a run may belong to transactions that commit
+# after it; the next run looks back this far to pick them up.
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+
+def changed_class_ids(since):
+    """
+    Ids of classes with any enrollment, note or counter change after ``since``.
+
+    Deleted rows leave nothing to query here (and a Tombstone does not say
+    which class a row belonged to). Deletions are found through the counter
+    of the row that survives them instead: every enrollment or note delete,
+    cascaded or not, and every archived note moves Class.updated_at or
+    Enrollment.updated_at in the same transaction (tracker.signals,
+    tracker.counters).
+    """
+    ids = set(Class.objects.filter(updated_at__gt=since).values_list('id', flat=True))
+    ids.update(Enrollment.objects.filter(updated_at__gt=since).values_list('classroom_id', flat=True))
+    # Note edits; added and deleted notes also move Enrollment.updated_at
+    # through the note counter.
+    ids.update(
+        Note.objects.filter(updated_at__gt=since).values_list('enrollment__classroom_id', flat=True)
+    )
+    return ids
+
+
+def _student_list(enrollments):
+    return [
+        {'student_id': e['student_id'], 'full_name': e['student__full_name'], 'note_count': e['note_count']}
+        for e in enrollments
+    ]
+
+
+def _week(field):
+    return TruncWeek(field, output_field=DateField())
+
+
+def refresh_class(classroom_id):
+    """Recompute the weekly rows and the summary of one class."""
+    enrollments = Enrollment.objects.filter(classroom_id=classroom_id).order_by()
+
+    joined = dict(
+        enrollments.annotate(week=_week('joined_at')).values('week')
+        .annotate(n=Count('id')).values_list('week', 'n')
+    )
+    written = dict(
+        Note.objects.filter(enrollment__classroom_id=classroom_id).order_by()
+        .annotate(week=_week('created_at')).values('week')
+        .annotate(n=Count('id')).values_list('week', 'n')
+    )
+    # Per-student note totals come from the denormalized counter
+    totals = enrollments.aggregate(students=Count('id'), notes=Sum('note_count'))
+    ranking = enrollments.values('student_id', 'student__full_name', 'note_count')
+
+    with transaction.atomic():
+        ClassWeeklyStats.objects.filter(classroom_id=classroom_id).delete()
+        ClassWeeklyStats.objects.bulk_create([
+            ClassWeeklyStats(
+                classroom_id=classroom_id,
+                week=w,
+                students_joined=joined.get(w, 0),
+                notes_written=written.get(w, 0),
+            )
+            for w in sorted(set(joined) | set(written))
+        ])
+        ClassStatsSummary.objects.update_or_create(
+            classroom_id=classroom_id,
+            defaults={
+                'student_count': totals['students'],
+                'note_count': totals['notes'] or 0,
+                'most_notes': _student_list(ranking.order_by('-note_count', 'student__full_name')[:TOP_STUDENTS]),
+                'fewest_notes': _student_list(ranking.order_by('note_count', 'student__full_name')[:TOP_STUDENTS]),
+                'refreshed_at': timezone.now(),
+            },
+        )
+
+
+def refresh_class_stats(full=False, class_ids=None):
+    """
+    Refresh rollups of changed classes (all of them with ``full``, or just
+    ``class_ids``) and move the watermark. Returns the number refreshed.
+    """
+    started = timezone.now()
+    watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).first()
+
+    if class_ids is not None:
+        ids = set(class_ids)
+    elif full or watermark is None:
+        ids = set(Class.objects.values_list('id', flat=True))
+    else:
+        ids = changed_class_ids(watermark.value - WATERMARK_OVERLAP)
+
+    # Classes deleted meanwhile lose their rollups through the FK cascade
+    ids = set(Class.objects.filter(id__in=ids).values_list('id', flat=True))
+    for classroom_id in sorted(ids):
+        refresh_class(classroom_id)
+
+    if class_ids is None:
+        RollupWatermark.objects.update_or_create(name=WATERMARK_NAME, defaults={'value': started})
+    return len(ids)
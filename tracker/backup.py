@@ -0,0 +1,158 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from django.utils import timezone
+
+
+# ======================================================
+# 💾 ONLINE BACKUP (SQLite backup API)
+# ======================================================
+# The live database is copied page by page with sqlite3.Connection.backup().
+# Each step holds the read lock for only ``pages`` pages, followed by a
+# pause, so note writes keep getting through while a large file is copied.
+# The copy goes to a ``.partial`` file, is integrity-checked, optionally
+# gzipped, and only then renamed into place: a finished name is always a
+# complete backup.
+#
+# SQLite restarts a stepwise backup from page one whenever another connection
+# writes to the source. On a busy database that can go on forever, so after
+# ``max_restarts`` the copy is finished in a single step instead. In WAL mode
+# (TRACKER_DB_PROFILE=production) that step reads a snapshot and does not
+# block writers; with the default rollback journal it holds the read lock,
+# and so blocks writers, until the copy is done.
+
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_PAUSE_SECONDS = 0.05
+BACKUP_MAX_RESTARTS = 3
+BACKUP_KEEP = 7
+PARTIAL_SUFFIX = '.partial'
+BACKUP_SUFFIXES = ('.sqlite3', '.sqlite3.gz')
+
+
+class BackupError(Exception):
+    pass
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def backup_name(source):
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    return f"{Path(source).stem}-{stamp}.sqlite3"
+
+
+def _copy(source, target, pages, pause, max_restarts, progress):
+    """Copy ``source`` into ``target`` in steps; return how many times it restarted."""
+    restarts = 0
+    last_remaining = None
+
+    def step(status, remaining, total):
+        nonlocal restarts, last_remaining
+        if status == sqlite3.SQLITE_OK:
+            # A step that copied pages without getting any closer to the end
+            # started over at page one.
+            if last_remaining is not None and remaining >= last_remaining:
+                restarts += 1
+                if restarts > max_restarts:
+                    raise _TooManyRestarts
+            last_remaining = remaining
+        if progress:
+            progress(total - remaining, total)
+        if pause and remaining:
+            time.sleep(pause)
+
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    # A half-written copy is thrown away anyway; the finished file is synced
+    # once before it is renamed into place.
+    dst.execute('PRAGMA synchronous=OFF')
+    try:
+        try:
+            src.backup(dst, pages=pages, progress=step)
+        except _TooManyRestarts:
+            src.backup(dst)
+        # The copy inherits WAL mode from the source; a backup should be a
+        # single self-contained file.
+        dst.execute('PRAGMA journal_mode=DELETE')
+        return restarts
+    finally:
+        dst.close()
+        src.close()
+
+
+def _check(path):
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        result = conn.execute('PRAGMA quick_check').fetchone()[0]
+    finally:
+        conn.close()
+    if result != 'ok':
+        raise BackupError(f"Backup failed the integrity check: {result}")
+
+
+def _fsync(path):
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+def _gzip(path, target):
+    with open(path, 'rb') as raw, gzip.open(target, 'wb', compresslevel=6) as packed:
+        shutil.copyfileobj(raw, packed, 1024 * 1024)
+
+
+def rotate_backups(dest_dir, source, keep):
+    """Delete all but the ``keep`` newest backups of ``source``; return the deleted paths."""
+    if keep < 1:
+        # backups[:-0] would be every backup, including the one just taken
+        raise ValueError("keep must be at least 1")
+    backups = sorted(
+        path for path in Path(dest_dir).glob(f'{Path(source).stem}-*.sqlite3*')
+        if path.name.endswith(BACKUP_SUFFIXES)
+    )
+    stale = backups[:-keep]
+    for path in stale:
+        path.unlink()
+    return stale
+
+
+def backup_database(source, dest_dir, pages=BACKUP_PAGES_PER_STEP, pause=BACKUP_PAUSE_SECONDS,
+                    compress=False, keep=BACKUP_KEEP, verify=True,
+                    max_restarts=BACKUP_MAX_RESTARTS, progress=None):
+    """
+    Take a hot backup of the SQLite file ``source`` into ``dest_dir``.
+
+    Returns ``(path, restarts)``. ``progress(done, total)`` is called after
+    every step with page counts. ``keep=None`` disables rotation.
+    """
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    name = backup_name(source)
+    final = dest_dir / (name + '.gz' if compress else name)
+    copy = dest_dir / (name + PARTIAL_SUFFIX)
+    packed = final.with_name(final.name + PARTIAL_SUFFIX)
+
+    try:
+        restarts = _copy(source, copy, pages, pause, max_restarts, progress)
+        if verify:
+            _check(copy)
+        if compress:
+            _gzip(copy, packed)
+            _fsync(packed)
+            os.replace(packed, final)
+            copy.unlink()
+        else:
+            _fsync(copy)
+            os.replace(copy, final)
+    finally:
+        for leftover in (copy, packed):
+            if leftover.exists():
+                leftover.unlink()
+
+    if keep is not None:
+        rotate_backups(dest_dir, source, keep)
+    return final, restarts
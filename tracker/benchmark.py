@@ -0,0 +1,184 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+from django.urls import reverse
+
+from .models import Enrollment, Note
+
+
+# ======================================================
+# ⏱ VIEW BENCHMARKS
+# ======================================================
+# Every named route in tracker/urls.py is requested with sample ids taken from
+# the current database. Latency percentiles and the SQL query count are
+# compared against a budget; settings.TRACKER_BENCHMARK_BUDGETS overrides the
+# defaults per URL name.
+
+DEFAULT_BUDGET = {'p95_ms': 250, 'queries': 5}
+
+DEFAULT_BUDGETS = {
+    'class_list': {'queries': 1},
+    'class_detail': {'queries': 2},
+    'all_students': {'queries': 2},
+    'global_student_detail': {'queries': 2},
+    'load_notes_for_class': {'queries': 2},
+    'student_class_detail': {'queries': 2},
+    'export_data': {'p95_ms': 1000, 'queries': 1},
+}
+
+# Fixed values for URL arguments that are not object ids
+STATIC_KWARGS = {'dataset': 'rosters', 'fmt': 'csv'}
+
+# Extra query strings, e.g. to keep exports bounded to one class
+EXTRA_QUERY = {
+    'export_data': lambda sample: {'class_id': sample['class_id']},
+    'search': lambda sample: {'q': 'a'},
+    'student_options': lambda sample: {'q': 'ak'},
+}
+
+
+def get_budget(name):
+    budget = dict(DEFAULT_BUDGET)
+    budget.update(DEFAULT_BUDGETS.get(name, {}))
+    budget.update(getattr(settings, 'TRACKER_BENCHMARK_BUDGETS', {}).get(name, {}))
+    return budget
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    rank = max(1, -(-len(samples) * pct // 100))
+    return samples[int(rank) - 1]
+
+
+def sample_ids():
+    """Ids of one enrollment (preferably with notes) and its related objects."""
+    note = Note.objects.select_related('enrollment').order_by('id').first()
+    enrollment = note.enrollment if note else Enrollment.objects.order_by('id').first()
+    if enrollment is None:
+        return None
+    return {
+        'class_id': enrollment.classroom_id,
+        'student_id': enrollment.student_id,
+        'pk': enrollment.student_id,
+        'enrollment_id': enrollment.id,
+        'note_id': note.id if note else None,
+    }
+
+
+def _benchmark_host():
+    hosts = [h for h in settings.ALLOWED_HOSTS if h and h != '*' and not h.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def iter_routes():
+    """Yield (name, argument names) for every named tracker route."""
+    from . import urls
+
+    for pattern in urls.urlpatterns:
+        if pattern.name:
+            yield pattern.name, list(pattern.pattern.converters)
+
+
+class BenchmarkResult:
+    def __init__(self, name, url, budget):
+        self.name = name
+        self.url = url
+        self.budget = budget
+        self.status = None
+        self.timings = []
+        self.queries = 0
+        self.skipped = ''
+
+    @property
+    def p50(self):
+        return percentile(self.timings, 50)
+
+    @property
+    def p95(self):
+        return percentile(self.timings, 95)
+
+    @property
+    def p99(self):
+        return percentile(self.timings, 99)
+
+    @property
+    def failures(self):
+        if self.skipped:
+            return []
+        problems = []
+        if self.status is None or self.status >= 400:
+            problems.append(f"HTTP {self.status}")
+        if self.p95 > self.budget['p95_ms']:
+            problems.append(f"p95 {self.p95:.1f}ms > {self.budget['p95_ms']}ms")
+        if self.queries > self.budget['queries']:
+            problems.append(f"{self.queries} queries > {self.budget['queries']}")
+        return problems
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _measure(client, url, query, iterations, warmup, result):
+    for i in range(warmup + iterations):
+        # Counted on every alias: @read_only views query the replica, not
+        # 'default'. (An execute wrapper, unlike CaptureQueriesContext, does
+        # not open a connection to aliases the view never uses.)
+        counter = _QueryCounter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(counter))
+            start = time.perf_counter()
+            response = client.get(url, query)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            elapsed = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+        result.status = response.status_code
+        result.timings.append(elapsed)
+        result.queries = max(result.queries, counter.count)
+    result.timings.sort()
+
+
+def run_benchmarks(iterations=20, warmup=2, names=None):
+    """Benchmark every GET-able tracker URL and return a list of BenchmarkResult."""
+    sample = sample_ids()
+    client = Client(HTTP_HOST=_benchmark_host())
+    results = []
+
+    for name, arg_names in iter_routes():
+        if names and name not in names:
+            continue
+        result = BenchmarkResult(name, None, get_budget(name))
+        results.append(result)
+
+        kwargs = {}
+        for arg in arg_names:
+            value = STATIC_KWARGS.get(arg, sample.get(arg) if sample else None)
+            if value is None:
+                result.skipped = f"no sample for '{arg}'"
+                break
+            kwargs[arg] = value
+        if result.skipped:
+            continue
+
+        result.url = reverse(name, kwargs=kwargs)
+        query = EXTRA_QUERY[name](sample) if name in EXTRA_QUERY and sample else {}
+        if client.get(result.url, query).status_code == 405:
+            result.skipped = "POST only"
+            continue
+        _measure(client, result.url, query, iterations, warmup, result)
+
+    return results
@@ -0,0 +1,121 @@
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Class, Enrollment, Student
+from .routers import reading_from_replica
+
+
+# ======================================================
+# 🗄 CACHED FRAGMENTS
+# ======================================================
+# Cached HTML is keyed by a generation token. Signals replace the token when
+# the underlying rows change, so stale entries are never read again and simply
+# expire; nothing has to be deleted explicitly.
+#
+# Misses are always rendered from the primary ('default'), also in @read_only
+# views: a replica that lags behind the token bump would otherwise store the
+# old rows under the new token, where no later write replaces them.
+
+CLASS_LIST_GENERATION_KEY = 'tracker:class_list:generation'
+CLASS_GRID_TIMEOUT = 60 * 60 * 24
+
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+def class_list_generation():
+    generation = cache.get(CLASS_LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(CLASS_LIST_GENERATION_KEY, _new_token(), None)
+        generation = cache.get(CLASS_LIST_GENERATION_KEY)
+    return generation
+
+
+def bump_class_list_generation():
+    cache.set(CLASS_LIST_GENERATION_KEY, _new_token(), None)
+
+
+def class_grid_html():
+    """Rendered class grid for the home page, from cache while no class changed."""
+    key = f'tracker:class_grid:{class_list_generation()}'
+    html = cache.get(key)
+    if html is None:
+        with reading_from_replica(False):
+            classes = list(Class.objects.order_by('name'))
+        html = render_to_string('tracker/partials/class_grid.html', {'classes': classes})
+        cache.set(key, html, CLASS_GRID_TIMEOUT)
+    # Cached strings may come back as plain str from other backends
+    return mark_safe(html)
+
+
+# ------------------------------------------------------
+# Student directory rows (name + enrolled class chips)
+# ------------------------------------------------------
+# Each student has its own version token, replaced by the Student,
+# Enrollment and Class signals (and by bulk paths that skip signals). A row
+# is cached under (student id, version), so one changed student or class
+# only re-renders the rows it appears in.
+
+STUDENT_ROW_TIMEOUT = 60 * 60 * 24
+
+
+def _student_version_key(student_id):
+    return f'tracker:student:{student_id}:version'
+
+
+def student_versions(student_ids):
+    """Current version token per student id, creating missing ones."""
+    keys = {student_id: _student_version_key(student_id) for student_id in student_ids}
+    found = cache.get_many(keys.values())
+    versions, missing = {}, {}
+    for student_id, key in keys.items():
+        if key in found:
+            versions[student_id] = found[key]
+        else:
+            versions[student_id] = missing[key] = _new_token()
+    if missing:
+        cache.set_many(missing, None)
+    return versions
+
+
+def bump_student_versions(student_ids):
+    # Dropping the token is enough: the next read starts a new version
+    cache.delete_many([_student_version_key(student_id) for student_id in set(student_ids)])
+
+
+def student_rows_html(students):
+    """
+    Rendered directory row per student, in order.
+
+    Cached rows come back with one get_many; only the students that missed
+    are loaded again, with their enrollments prefetched, and rendered.
+    """
+    versions = student_versions(s.id for s in students)
+    keys = {s.id: f'tracker:student_row:{s.id}:{versions[s.id]}' for s in students}
+    rows = cache.get_many(keys.values())
+
+    missed = [s.id for s in students if keys[s.id] not in rows]
+    if missed:
+        # Re-read from the primary, with the enrollments: ``students`` may
+        # come from the replica
+        with reading_from_replica(False):
+            fresh = Student.objects.prefetch_related(
+                Prefetch('enrollments', queryset=Enrollment.objects.select_related('classroom')),
+            ).in_bulk(missed)
+        rendered = {
+            keys[student_id]: render_to_string('tracker/partials/student_row.html', {'s': s})
+            for student_id, s in fresh.items()
+        }
+        cache.set_many(rendered, STUDENT_ROW_TIMEOUT)
+        rows.update(rendered)
+        # Deleted on the primary meanwhile: shown as listed, not cached
+        for s in students:
+            if keys[s.id] not in rows:
+                rows[keys[s.id]] = render_to_string('tracker/partials/student_row.html', {'s': s})
+    # Cached strings may come back as plain str from other backends
+    return [mark_safe(rows[keys[s.id]]) for s in students]
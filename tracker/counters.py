@@ -0,0 +1,89 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .caching import bump_class_list_generation
+from .models import Class, Enrollment, Note
+
+
+# ======================================================
+# 🔢 DENORMALIZED COUNTERS
+# ======================================================
+# Class.student_count and Enrollment.note_count are adjusted with F()
+# expressions in the write paths (a single atomic UPDATE each), so pages can
+# show them without COUNT(*) aggregates. Single-row creates and all deletes
+# (views, admin, cascades) are counted by signals (tracker.signals); bulk
+# inserts call these helpers themselves. reconcile_counters() recomputes both
+# for rows touched outside those paths (raw SQL). Every counter change also
+# moves updated_at, so delta sync picks it up.
+
+
+def _plus(field, delta):
+    # Never below zero (the columns are unsigned), even over drift that
+    # reconcile_counters() has not repaired yet
+    return Greatest(F(field) + delta, 0) if delta < 0 else F(field) + delta
+
+
+def adjust_student_count(class_id, delta=1):
+    Class.objects.filter(pk=class_id).update(
+        student_count=_plus('student_count', delta), updated_at=timezone.now(),
+    )
+    # The home page grid shows the count
+    transaction.on_commit(bump_class_list_generation)
+
+
+def adjust_student_counts(class_ids):
+    """Add one per occurrence of each class id, e.g. after a bulk enrollment insert."""
+    for class_id, delta in Counter(class_ids).items():
+        Class.objects.filter(pk=class_id).update(
+            student_count=F('student_count') + delta, updated_at=timezone.now(),
+        )
+    transaction.on_commit(bump_class_list_generation)
+
+
+def adjust_note_count(enrollment_id, delta=1):
+    Enrollment.objects.filter(pk=enrollment_id).update(
+        note_count=_plus('note_count', delta), updated_at=timezone.now(),
+    )
+
+
+def _count_of(model, fk):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk: OuterRef('pk')})
+            .order_by()
+            .values(fk)
+            .annotate(n=Count('*'))
+            .values('n')
+        ),
+        0,
+    )
+
+
+def _reconcile(queryset, field, actual, batch_size):
+    fixed = 0
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return fixed
+        last_id = ids[-1]
+        with transaction.atomic():
+            fixed += (
+                queryset.filter(pk__in=ids)
+                .alias(actual=actual)
+                .exclude(**{field: F('actual')})
+                .update(**{field: actual, 'updated_at': timezone.now()})
+            )
+
+
+def reconcile_counters(batch_size=5000):
+    """Recompute both counters in id-range batches; return rows corrected per counter."""
+    classes = _reconcile(Class.objects.all(), 'student_count', _count_of(Enrollment, 'classroom'), batch_size)
+    if classes:
+        transaction.on_commit(bump_class_list_generation)
+    enrollments = _reconcile(Enrollment.objects.all(), 'note_count', _count_of(Note, 'enrollment'), batch_size)
+    return {'student_count': classes, 'note_count': enrollments}
@@ -0,0 +1,44 @@
+from django.conf import settings
+
+
+# ======================================================
+# 🛢 SQLITE CONNECTION TUNING
+# ======================================================
+# Applied to every new SQLite connection when settings.SQLITE_TUNING is on
+# (the "production" database profile). WAL lets readers and one writer work
+# at the same time; busy_timeout makes writers wait for the lock instead of
+# failing with "database is locked".
+
+PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',        # safe with WAL, fsync only at checkpoints
+    'busy_timeout': 5000,           # ms
+    'cache_size': -64000,           # KiB (negative) → ~64 MB page cache
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def sqlite_pragmas():
+    pragmas = dict(PRODUCTION_PRAGMAS)
+    pragmas.update(getattr(settings, 'SQLITE_PRAGMAS', {}))
+    return pragmas
+
+
+def is_read_only(connection):
+    """Connections opened with ``file:...?mode=ro`` (the 'replica' alias)."""
+    return 'mode=ro' in str(connection.settings_dict['NAME'])
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """connection_created handler that applies the PRAGMAs above."""
+    if connection.vendor != 'sqlite' or not getattr(settings, 'SQLITE_TUNING', False):
+        return
+    read_only = is_read_only(connection)
+    with connection.cursor() as cursor:
+        for name, value in sqlite_pragmas().items():
+            # Changing the journal mode needs write access; the writer
+            # connection has already switched the file to WAL.
+            if read_only and name == 'journal_mode':
+                continue
+            cursor.execute(f'PRAGMA {name} = {value}')
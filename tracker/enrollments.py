@@ -0,0 +1,143 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .caching import bump_student_versions
+from .counters import adjust_student_count
+from .models import Enrollment, Note, Student
+from .pubsub import note_saved_message, publish_note_event
+
+BROADCAST_BATCH_SIZE = 500
+MAX_STUDENT_ID = 2 ** 63 - 1  # largest SQLite INTEGER
+
+
+# ======================================================
+# 👥 BULK ENROLLMENT
+# ======================================================
+class BulkEnrollResult:
+    def __init__(self, created=0, skipped=0, unknown=(), ambiguous=()):
+        self.created = created
+        self.skipped = skipped
+        self.unknown = list(unknown)      # ids / names with no matching student
+        self.ambiguous = list(ambiguous)  # names shared by several students
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'unknown': self.unknown,
+            'ambiguous': self.ambiguous,
+        }
+
+
+def parse_student_id(value):
+    """
+    An int or a decimal string as a student id, or None for anything else
+    (bools, floats, "²", ids beyond SQLite's INTEGER range).
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdecimal():
+            return None
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value if 0 < value <= MAX_STUDENT_ID else None
+
+
+def resolve_roster(lines):
+    """
+    Turn pasted roster lines (student ids or exact full names) into ids.
+
+    Returns ``(ids, unknown, ambiguous)``; names are resolved with a single
+    ``full_name IN (...)`` query.
+    """
+    ids, names = [], []
+    for line in lines:
+        line = line.strip()
+        student_id = parse_student_id(line)
+        if student_id is not None:
+            ids.append(student_id)
+        elif line:
+            names.append(line)
+
+    by_name = {}
+    if names:
+        for student_id, full_name in Student.objects.filter(full_name__in=names).values_list('id', 'full_name'):
+            by_name.setdefault(full_name, []).append(student_id)
+
+    unknown, ambiguous = [], []
+    for name in dict.fromkeys(names):
+        matches = by_name.get(name, [])
+        if len(matches) == 1:
+            ids.append(matches[0])
+        elif matches:
+            ambiguous.append(name)
+        else:
+            unknown.append(name)
+    return ids, unknown, ambiguous
+
+
+def bulk_enroll(classroom, student_ids, unknown=(), ambiguous=()):
+    """
+    Enroll many students into ``classroom`` with one INSERT.
+
+    Rows hitting the (student, classroom) unique constraint are skipped by
+    ``bulk_create(ignore_conflicts=True)``; created/skipped counts are
+    derived from the number of enrollments before and after the insert.
+    """
+    wanted = list(dict.fromkeys(student_ids))
+    existing_ids = set(Student.objects.filter(id__in=wanted).values_list('id', flat=True))
+    unknown = list(unknown) + [str(i) for i in wanted if i not in existing_ids]
+    wanted = [i for i in wanted if i in existing_ids]
+    if not wanted:
+        return BulkEnrollResult(unknown=unknown, ambiguous=ambiguous)
+
+    enrolled = Enrollment.objects.filter(classroom=classroom, student_id__in=wanted)
+    with transaction.atomic():
+        before = enrolled.count()
+        Enrollment.objects.bulk_create(
+            [Enrollment(student_id=i, classroom=classroom) for i in wanted],
+            ignore_conflicts=True,
+        )
+        created = enrolled.count() - before
+        if created:
+            adjust_student_count(classroom.id, created)
+            # bulk_create sends no signals; the directory rows show the classes
+            transaction.on_commit(lambda: bump_student_versions(wanted))
+
+    return BulkEnrollResult(
+        created=created,
+        skipped=len(wanted) - created,
+        unknown=unknown,
+        ambiguous=ambiguous,
+    )
+
+
+# ======================================================
+# 📣 NOTE TO THE WHOLE CLASS
+# ======================================================
+def broadcast_note(classroom, content, batch_size=BROADCAST_BATCH_SIZE):
+    """
+    Add the same note to every enrollment of ``classroom``.
+
+    The notes go in with one ``bulk_create`` and every ``note_count`` is
+    bumped with a single UPDATE, so the cost does not grow with one query
+    per student. Returns ``{enrollment_id: new note_count}``.
+    """
+    # order_by() drops Meta.ordering, which would join class and student
+    enrollments = Enrollment.objects.filter(classroom=classroom).order_by()
+    with transaction.atomic():
+        ids = list(enrollments.values_list('id', flat=True))
+        if not ids:
+            return {}
+        notes = Note.objects.bulk_create(
+            [Note(enrollment_id=i, content=content) for i in ids],
+            batch_size=batch_size,
+        )
+        enrollments.update(note_count=F('note_count') + 1, updated_at=timezone.now())
+        # bulk_create sends no post_save, so live streams are told here
+        transaction.on_commit(lambda: [
+            publish_note_event(note.enrollment_id, note_saved_message(note)) for note in notes
+        ])
+        return dict(enrollments.values_list('id', 'note_count'))
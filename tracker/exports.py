@@ -0,0 +1,125 @@
+import csv
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Enrollment, Note
+
+
+# ======================================================
+# 📤 STREAMING EXPORTS (rosters & notes)
+# ======================================================
+# Rows are produced from server-side cursors (.iterator) and encoded one at
+# a time, so memory stays flat however many enrollments or notes exist.
+# Under ASGI a response needs an async iterator (a sync one is read into
+# memory in full first); astream_export() provides it.
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('csv', 'json')
+
+ROSTER_FIELDS = (
+    'class_id', 'class', 'subject', 'student_id', 'student', 'email', 'phone', 'joined_at',
+)
+NOTE_FIELDS = (
+    'note_id', 'class_id', 'class', 'student_id', 'student', 'content', 'created_at', 'updated_at',
+)
+
+
+def roster_rows(class_id=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """One row per enrollment, grouped by class."""
+    enrollments = Enrollment.objects.select_related('student', 'classroom')
+    if class_id is not None:
+        enrollments = enrollments.filter(classroom_id=class_id)
+    enrollments = enrollments.order_by('classroom__name', 'student__full_name', 'id')
+
+    for e in enrollments.iterator(chunk_size=chunk_size):
+        yield {
+            'class_id': e.classroom_id,
+            'class': e.classroom.name,
+            'subject': e.classroom.subject,
+            'student_id': e.student_id,
+            'student': e.student.full_name,
+            'email': e.student.email or '',
+            'phone': e.student.phone or '',
+            'joined_at': e.joined_at,
+        }
+
+
+def note_rows(class_id=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """One row per note with its student and class, in insertion order."""
+    notes = Note.objects.select_related('enrollment__student', 'enrollment__classroom')
+    if class_id is not None:
+        notes = notes.filter(enrollment__classroom_id=class_id)
+    notes = notes.order_by('id')
+
+    for n in notes.iterator(chunk_size=chunk_size):
+        yield {
+            'note_id': n.id,
+            'class_id': n.enrollment.classroom_id,
+            'class': n.enrollment.classroom.name,
+            'student_id': n.enrollment.student_id,
+            'student': n.enrollment.student.full_name,
+            'content': n.content,
+            'created_at': n.created_at,
+            'updated_at': n.updated_at,
+        }
+
+
+DATASETS = {
+    'rosters': (ROSTER_FIELDS, roster_rows),
+    'notes': (NOTE_FIELDS, note_rows),
+}
+
+
+class _Echo:
+    """File-like object whose write() just hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(fields, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[f] for f in fields])
+
+
+def stream_json(rows):
+    """Encode ``rows`` as a JSON array, one element at a time."""
+    yield '['
+    separator = '\n'
+    for row in rows:
+        yield separator + json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+        separator = ',\n'
+    yield '\n]\n'
+
+
+def stream_export(dataset, fmt, class_id=None):
+    """Return an iterator of text chunks for ``dataset`` in ``fmt``."""
+    fields, producer = DATASETS[dataset]
+    rows = producer(class_id=class_id)
+    if fmt == 'csv':
+        return stream_csv(fields, rows)
+    return stream_json(rows)
+
+
+async def astream_export(dataset, fmt, class_id=None, chunk_size=None):
+    """
+    Async iterator over the same chunks, for ASGI responses.
+
+    The sync stream is advanced in the request's thread-sensitive executor
+    (where the async ORM runs too), ``chunk_size`` lines per hop.
+    """
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    chunks = stream_export(dataset, fmt, class_id=class_id)
+    take = sync_to_async(lambda: ''.join(islice(chunks, chunk_size)))
+    try:
+        while block := await take():
+            yield block
+    finally:
+        # Release the cursor when the client goes away mid-download
+        await sync_to_async(chunks.close)()
@@ -38,11 +38,18 @@ class ClassForm(forms.ModelForm):
 # 👨‍🏫 ENROLL EXISTING STUDENT FORM
 # ======================================================
 class EnrollStudentForm(forms.Form):
-    """Form for enrolling an existing student into a class."""
+    """
+    Form for enrolling an existing student into a class.
+
+    The student is picked with the type-ahead search (``student_options``)
+    and posted as a hidden id, validated with a single primary-key lookup
+    instead of rendering an <option> for every student.
+    """
     student = forms.ModelChoiceField(
-        queryset=Student.objects.all().order_by('full_name'),
-        widget=forms.Select(attrs={'class': 'form-select'}),
+        queryset=Student.objects.all(),
+        widget=forms.HiddenInput(),
         label="Select a student to enroll",
+        error_messages={'required': "O‘quvchini tanlang.", 'invalid_choice': "Bunday o‘quvchi topilmadi."},
     )
 
 
@@ -79,6 +86,17 @@ class StudentCreateForm(forms.ModelForm):
         }
 
 
+# ======================================================
+# 📥 BULK STUDENT IMPORT FORM
+# ======================================================
+class StudentImportForm(forms.Form):
+    """Upload form for a CSV/XLSX roster of students."""
+    file = forms.FileField(
+        label="CSV or XLSX file",
+        widget=forms.ClearableFileInput(attrs={'accept': '.csv,.xlsx'}),
+    )
+
+
 # ======================================================
 # ✏️ EDIT STUDENT FORM
 # ======================================================
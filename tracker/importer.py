@@ -0,0 +1,162 @@
+import csv
+import io
+import zipfile
+from itertools import chain
+
+from django.db import transaction
+
+from .counters import adjust_student_counts
+from .forms import StudentCreateForm
+from .models import Class, Enrollment, Student
+
+
+# ======================================================
+# 📥 BULK STUDENT IMPORT (CSV / XLSX)
+# ======================================================
+# Rows are read lazily, validated with the same rules as StudentCreateForm
+# and written in batches: one bulk INSERT for the students of a batch and one
+# for their enrollments, each batch in its own short transaction.
+
+IMPORT_BATCH_SIZE = 1000
+CLASS_SEPARATOR = ';'
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be read at all (bad format, missing columns)."""
+
+
+class ImportResult:
+    def __init__(self):
+        self.rows = 0
+        self.students_created = 0
+        self.enrollments_created = 0
+        self.errors = []  # (line number, message)
+        # Set when the file turned unreadable part way through: rows before
+        # ``stopped_at`` are saved, the rest were not read
+        self.file_error = None
+        self.stopped_at = None
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+
+def _read_csv(fileobj):
+    if isinstance(fileobj, io.TextIOBase):
+        text = fileobj
+    else:
+        text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.DictReader(text)
+    except UnicodeDecodeError:
+        raise ImportFileError("The file is not UTF-8 encoded; save it as \"CSV UTF-8\" and try again.")
+    except csv.Error as exc:
+        raise ImportFileError(f"The file is not a valid CSV file ({exc}).")
+
+
+def _read_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError("Reading .xlsx files requires the openpyxl package.")
+
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell or '').strip() for cell in next(rows, ())]
+            for values in rows:
+                yield dict(zip(header, ('' if v is None else v for v in values)))
+        finally:
+            workbook.close()
+    except (zipfile.BadZipFile, InvalidFileException, KeyError) as exc:
+        raise ImportFileError(f"The file is not a valid .xlsx workbook ({exc}).")
+
+
+def read_rows(fileobj, filename=''):
+    """Yield one dict per data row of a CSV or XLSX file."""
+    if filename.lower().endswith('.xlsx'):
+        return _read_xlsx(fileobj)
+    return _read_csv(fileobj)
+
+
+def _row_errors(form):
+    return '; '.join(
+        f"{field}: {' '.join(messages)}" for field, messages in form.errors.items()
+    )
+
+
+def _flush(batch, result):
+    if not batch:
+        return
+    with transaction.atomic():
+        students = Student.objects.bulk_create([student for student, _ in batch])
+        enrollments = [
+            Enrollment(student=student, classroom_id=class_id)
+            for student, (_, class_ids) in zip(students, batch)
+            for class_id in class_ids
+        ]
+        Enrollment.objects.bulk_create(enrollments)
+        adjust_student_counts(e.classroom_id for e in enrollments)
+    result.students_created += len(students)
+    result.enrollments_created += len(enrollments)
+    batch.clear()
+
+
+def _numbered(rows, result):
+    """(line, row) pairs; a read error ends them and is recorded on ``result``."""
+    line = 1
+    try:
+        for row in rows:
+            line += 1
+            yield line, row
+    except ImportFileError as exc:
+        # The decoder reads ahead, so this is the first line not imported
+        # rather than necessarily the broken one
+        result.file_error, result.stopped_at = str(exc), line + 1
+
+
+def import_students(rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validate and insert students (and their enrollments) from ``rows``.
+
+    Each row needs the StudentCreateForm fields plus an optional ``classes``
+    column listing existing class names separated by ``;``. Invalid rows are
+    skipped and reported in ``ImportResult.errors`` with their line number.
+
+    A file that cannot be read at all raises ImportFileError. One that turns
+    unreadable further down (a non-UTF-8 line, broken quoting) is not rolled
+    back: the valid rows before it are saved and the result carries
+    ``file_error`` and the ``stopped_at`` line, to import the rest from.
+    """
+    result = ImportResult()
+    class_ids = dict(Class.objects.values_list('name', 'id'))
+    batch = []
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return result
+    if 'full_name' not in first:
+        raise ImportFileError("The file must have a 'full_name' column.")
+
+    for line, row in _numbered(chain([first], rows), result):
+        result.rows += 1
+        form = StudentCreateForm(data=row)
+        if not form.is_valid():
+            result.add_error(line, _row_errors(form))
+            continue
+
+        names = [n.strip() for n in str(row.get('classes') or '').split(CLASS_SEPARATOR) if n.strip()]
+        unknown = [n for n in names if n not in class_ids]
+        if unknown:
+            result.add_error(line, f"classes: unknown class {', '.join(unknown)}")
+            continue
+
+        batch.append((form.save(commit=False), {class_ids[n] for n in names}))
+        if len(batch) >= batch_size:
+            _flush(batch, result)
+
+    _flush(batch, result)
+    return result
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from tracker.archive import (
+    ARCHIVE_BATCH_SIZE, ARCHIVE_PAUSE_SECONDS, DEFAULT_RETENTION_DAYS, archivable_notes, archive_notes,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move notes older than a cutoff, and notes of ended classes, into the "
+        "compressed archive table. Each --batch-size batch is one short write "
+        "transaction followed by a --pause, so note writes get the database lock "
+        "in between; an interrupted run can simply be started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=DEFAULT_RETENTION_DAYS)
+        parser.add_argument(
+            '--skip-ended-classes', action='store_true',
+            help="Only archive by age, not notes of classes with ended_at set.",
+        )
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help="Notes moved per transaction.")
+        parser.add_argument('--pause', type=float, default=ARCHIVE_PAUSE_SECONDS, help="Seconds to sleep between batches.")
+        parser.add_argument('--limit', type=int, help="Stop after this many notes.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the notes that would be archived.")
+
+    def handle(self, *args, **options):
+        ended_classes = not options['skip_ended_classes']
+        if options['dry_run']:
+            count = archivable_notes(options['older_than_days'], ended_classes).count()
+            self.stdout.write(f"{count} notes would be archived.")
+            return
+
+        moved = archive_notes(
+            older_than_days=options['older_than_days'],
+            ended_classes=ended_classes,
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            limit=options['limit'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} notes."))
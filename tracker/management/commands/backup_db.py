@@ -0,0 +1,74 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from tracker.backup import (
+    BACKUP_KEEP, BACKUP_MAX_RESTARTS, BACKUP_PAGES_PER_STEP, BACKUP_PAUSE_SECONDS, BackupError, backup_database,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Take an online backup of the SQLite database with the backup API. The "
+        "copy is made --pages pages at a time with a --pause in between, each "
+        "step holding only a read lock, so note writes get through between steps "
+        "(after --max-restarts restarts caused by writes it finishes in one step)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dest-dir', default=settings.BACKUP_DIR, help="Directory for the backup files.")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--pages', type=int, default=BACKUP_PAGES_PER_STEP, help="Pages copied per step.")
+        parser.add_argument('--pause', type=float, default=BACKUP_PAUSE_SECONDS, help="Seconds to sleep between steps.")
+        parser.add_argument('--compress', action='store_true', help="Gzip the finished backup.")
+        parser.add_argument('--keep', type=int, default=BACKUP_KEEP, help="Newest backups to keep (at least 1).")
+        parser.add_argument('--keep-all', action='store_true', help="Do not delete older backups.")
+        parser.add_argument(
+            '--max-restarts', type=int, default=BACKUP_MAX_RESTARTS,
+            help="Restarts caused by concurrent writes before finishing in a single step.",
+        )
+        parser.add_argument('--no-verify', action='store_true', help="Skip PRAGMA quick_check on the copy.")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError("backup_db only supports SQLite databases.")
+        source = connection.settings_dict['NAME']
+        if options['pages'] < 1:
+            raise CommandError("--pages must be at least 1.")
+        if options['keep'] < 1:
+            raise CommandError("--keep must be at least 1; use --keep-all to keep every backup.")
+
+        def progress(done, total):
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {done}/{total} pages")
+
+        started = time.perf_counter()
+        try:
+            path, restarts = backup_database(
+                source,
+                options['dest_dir'],
+                pages=options['pages'],
+                pause=options['pause'],
+                compress=options['compress'],
+                keep=None if options['keep_all'] else options['keep'],
+                verify=not options['no_verify'],
+                max_restarts=options['max_restarts'],
+                progress=progress,
+            )
+        except (BackupError, OSError, sqlite3.Error) as exc:
+            raise CommandError(str(exc))
+
+        if restarts > options['max_restarts']:
+            self.stdout.write(self.style.WARNING(
+                "Concurrent writes kept restarting the backup, so it was finished in one step. "
+                "Use TRACKER_DB_PROFILE=production (WAL) so that step does not block writers."
+            ))
+        elif restarts:
+            self.stdout.write(f"Restarted {restarts} times because of concurrent writes.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Backed up to {path} ({path.stat().st_size / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s."
+        ))
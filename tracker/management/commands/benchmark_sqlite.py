@@ -0,0 +1,151 @@
+import copy
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.test.utils import override_settings
+
+
+SCHEMA = (
+    """
+    CREATE TABLE note (
+        id INTEGER PRIMARY KEY,
+        enrollment_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX note_enrollment ON note (enrollment_id, updated_at)",
+)
+
+BENCH_ALIAS = 'benchmark_sqlite'
+
+
+def _profiles():
+    """(name, settings dict, SQLITE_TUNING, reconnect per operation)"""
+    configured = copy.deepcopy(settings.DATABASES[DEFAULT_DB_ALIAS])
+    return [
+        # What Django gives SQLite out of the box: rollback journal, full
+        # fsync, deferred transactions
+        ('django', {'ENGINE': 'django.db.backends.sqlite3'}, False, False),
+        # The shipped settings, through the real connection_created hook
+        (settings.DB_PROFILE, configured, settings.SQLITE_TUNING, False),
+        # Same, with a new connection per operation as under ASGI with
+        # CONN_MAX_AGE = 0
+        (f'{settings.DB_PROFILE}+reconnect', configured, settings.SQLITE_TUNING, True),
+    ]
+
+
+@contextmanager
+def _scratch_database(settings_dict):
+    """Register BENCH_ALIAS for a scratch SQLite file with ``settings_dict``."""
+    fd, path = tempfile.mkstemp(suffix='.sqlite3')
+    os.close(fd)
+    settings_dict = connections.configure_settings({DEFAULT_DB_ALIAS: {**settings_dict, 'NAME': path}})
+    connections.settings[BENCH_ALIAS] = settings_dict[DEFAULT_DB_ALIAS]
+    try:
+        yield
+    finally:
+        connections[BENCH_ALIAS].close()
+        del connections[BENCH_ALIAS]
+        del connections.settings[BENCH_ALIAS]
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent note write/read throughput on a scratch SQLite file "
+        "with Django's stock SQLite settings and with this project's configured "
+        "DATABASES (run with TRACKER_DB_PROFILE=production to measure the tuned one)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=5.0, help="Duration per profile.")
+        parser.add_argument('--read-ratio', type=float, default=0.7, help="Share of operations that are reads.")
+        parser.add_argument('--enrollments', type=int, default=500)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'profile':<22} {'writes/s':>10} {'reads/s':>10} {'locked':>8} {'p99 write ms':>13}")
+        for name, settings_dict, tuning, reconnect in _profiles():
+            with override_settings(SQLITE_TUNING=tuning), _scratch_database(settings_dict):
+                stats = self._run_profile(reconnect, options)
+            self.stdout.write(
+                f"{name:<22} {stats['writes'] / options['seconds']:>10.0f} "
+                f"{stats['reads'] / options['seconds']:>10.0f} {stats['locked']:>8} "
+                f"{stats['p99_write_ms']:>13.1f}"
+            )
+
+    def _run_profile(self, reconnect, options):
+        with transaction.atomic(using=BENCH_ALIAS), connections[BENCH_ALIAS].cursor() as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            cursor.executemany(
+                "INSERT INTO note (enrollment_id, content, updated_at) VALUES (%s, %s, datetime('now'))",
+                [(i % options['enrollments'], 'seed') for i in range(options['enrollments'] * 10)],
+            )
+        connections[BENCH_ALIAS].close()
+
+        stats = {'writes': 0, 'reads': 0, 'locked': 0, 'write_ms': []}
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['seconds']
+        workers = [
+            threading.Thread(target=self._worker, args=(reconnect, options, deadline, stats, lock))
+            for _ in range(options['threads'])
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        latencies = sorted(stats['write_ms'])
+        stats['p99_write_ms'] = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+        return stats
+
+    def _worker(self, reconnect, options, deadline, stats, lock):
+        # Each thread gets its own connection from the handler, opened (and
+        # tuned by the connection_created hook) on first use
+        rng = random.Random()
+        conn = connections[BENCH_ALIAS]
+        writes = reads = locked = 0
+        write_ms = []
+        while time.monotonic() < deadline:
+            enrollment_id = rng.randrange(options['enrollments'])
+            try:
+                if rng.random() < options['read_ratio']:
+                    with conn.cursor() as cursor:
+                        cursor.execute(
+                            "SELECT id, content, updated_at FROM note WHERE enrollment_id = %s "
+                            "ORDER BY updated_at DESC LIMIT 50",
+                            [enrollment_id],
+                        )
+                        cursor.fetchall()
+                    reads += 1
+                else:
+                    start = time.perf_counter()
+                    with transaction.atomic(using=BENCH_ALIAS), conn.cursor() as cursor:
+                        cursor.execute(
+                            "INSERT INTO note (enrollment_id, content, updated_at) "
+                            "VALUES (%s, %s, datetime('now'))",
+                            [enrollment_id, 'benchmark note'],
+                        )
+                    write_ms.append((time.perf_counter() - start) * 1000)
+                    writes += 1
+            except OperationalError:
+                locked += 1
+            if reconnect:
+                conn.close()
+        conn.close()
+        with lock:
+            stats['writes'] += writes
+            stats['reads'] += reads
+            stats['locked'] += locked
+            stats['write_ms'].extend(write_ms)
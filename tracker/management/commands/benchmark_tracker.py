@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.benchmark import run_benchmarks
+
+
+class Command(BaseCommand):
+    help = "Measure latency percentiles and query counts of every tracker URL against budgets."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('names', nargs='*', help="Only benchmark these URL names.")
+
+    def handle(self, *args, iterations, warmup, names, **options):
+        results = run_benchmarks(iterations=iterations, warmup=warmup, names=names)
+
+        self.stdout.write(
+            f"{'url name':<24} {'status':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7}  result"
+        )
+        failed = 0
+        for r in results:
+            if r.skipped:
+                self.stdout.write(f"{r.name:<24} {'-':>6} {'':>8} {'':>8} {'':>8} {'':>7}  skipped ({r.skipped})")
+                continue
+            problems = r.failures
+            failed += bool(problems)
+            verdict = self.style.ERROR('FAIL: ' + ', '.join(problems)) if problems else self.style.SUCCESS('ok')
+            self.stdout.write(
+                f"{r.name:<24} {r.status:>6} {r.p50:>8.1f} {r.p95:>8.1f} {r.p99:>8.1f} {r.queries:>7}  {verdict}"
+            )
+
+        if failed:
+            raise CommandError(f"{failed} URL(s) exceeded their budget.")
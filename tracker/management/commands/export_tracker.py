@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.exports import DATASETS, EXPORT_FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = "Stream class rosters or notes to a CSV/JSON file (or stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('--format', dest='fmt', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--class-id', type=int, help="Only export this class.")
+        parser.add_argument('-o', '--output', help="Output file (default: stdout).")
+
+    def handle(self, *args, dataset, fmt, class_id, output, **options):
+        chunks = stream_export(dataset, fmt, class_id=class_id)
+        if not output:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        try:
+            with open(output, 'w', encoding='utf-8', newline='') as fileobj:
+                fileobj.writelines(chunks)
+        except OSError as exc:
+            raise CommandError(exc)
+        self.stderr.write(self.style.SUCCESS(f"Wrote {dataset} to {output}"))
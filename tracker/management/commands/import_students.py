@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.importer import IMPORT_BATCH_SIZE, ImportFileError, import_students, read_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import students (and their class enrollments) from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV/XLSX file with a header row (full_name, email, ..., classes).")
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+            help="Rows written per transaction (default: %(default)s).",
+        )
+
+    def handle(self, *args, path, batch_size, **options):
+        try:
+            with open(path, 'rb') as fileobj:
+                result = import_students(read_rows(fileobj, path), batch_size=batch_size)
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(exc)
+
+        for line, message in result.errors:
+            self.stderr.write(f"line {line}: {message}")
+        summary = (
+            f"{result.rows} rows read: {result.students_created} students and "
+            f"{result.enrollments_created} enrollments created, {len(result.errors)} rows rejected."
+        )
+        if result.file_error:
+            self.stdout.write(summary)
+            raise CommandError(
+                f"Stopped at line {result.stopped_at}: {result.file_error} The rows above it are saved; "
+                f"import the rest from line {result.stopped_at} on."
+            )
+        self.stdout.write(self.style.SUCCESS(summary))
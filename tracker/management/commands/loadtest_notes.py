@@ -0,0 +1,160 @@
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from tracker.benchmark import percentile
+from tracker.models import Enrollment
+
+
+NOTE_ID_RE = re.compile(r'id="note-(\d+)"')
+
+# Where tracker.urls routes the sync note views (TRACKER_LOADTEST_SYNC_VIEWS=1)
+SYNC_PREFIX = '/loadtest/sync'
+IMPLEMENTATIONS = {'sync': SYNC_PREFIX, 'async': ''}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the sync and the async implementation of the note endpoints "
+        "on one running server and compare requests/s and latency percentiles. "
+        "Start the server with TRACKER_LOADTEST_SYNC_VIEWS=1 so the sync views "
+        "are routed; run it once against uvicorn (config.asgi:application) and "
+        "once against gunicorn (config.wsgi) to see both views under each stack."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', required=True, help="Base URL of the server, e.g. http://127.0.0.1:8000")
+        parser.add_argument(
+            '--views', nargs='+', choices=list(IMPLEMENTATIONS), default=list(IMPLEMENTATIONS),
+            help="Implementations to time (default: both).",
+        )
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=1000, help="Operations per implementation.")
+        parser.add_argument(
+            '--write-ratio', type=float, default=0.3,
+            help="Share of operations that add a note (then delete it again).",
+        )
+        parser.add_argument('--enrollments', type=int, default=100, help="Enrollments to spread the load over.")
+        parser.add_argument('--timeout', type=float, default=30.0)
+
+    def handle(self, *args, **options):
+        base_url = options['url'].rstrip('/')
+        enrollment_ids = list(
+            Enrollment.objects.order_by('-note_count').values_list('id', flat=True)[:options['enrollments']]
+        )
+        if not enrollment_ids:
+            raise CommandError("No enrollments to test against; run seed_tracker first.")
+        for label in options['views']:
+            self._check_routed(base_url, IMPLEMENTATIONS[label], enrollment_ids[0], options['timeout'])
+
+        self.stdout.write(
+            f"{'views':<8} {'requests':>9} {'errors':>7} {'req/s':>8} "
+            f"{'read p50':>9} {'read p99':>9} {'write p50':>10} {'write p99':>10}"
+        )
+        for label in options['views']:
+            stats = self._run_target(base_url + IMPLEMENTATIONS[label], enrollment_ids, options)
+            reads, writes = sorted(stats['read_ms']), sorted(stats['write_ms'])
+            self.stdout.write(
+                f"{label:<8} {stats['requests']:>9} {stats['errors']:>7} "
+                f"{stats['requests'] / stats['seconds']:>8.0f} "
+                f"{percentile(reads, 50):>9.1f} {percentile(reads, 99):>9.1f} "
+                f"{percentile(writes, 50):>10.1f} {percentile(writes, 99):>10.1f}"
+            )
+
+    def _check_routed(self, base_url, prefix, enrollment_id, timeout):
+        try:
+            _Client(base_url + prefix, timeout).load_notes(enrollment_id, raise_errors=True)
+        except HTTPError as exc:
+            if exc.code == 404 and prefix:
+                raise CommandError(
+                    f"{base_url}{prefix} is not routed; start the server with TRACKER_LOADTEST_SYNC_VIEWS=1."
+                )
+            raise CommandError(f"{base_url}: {exc}")
+        except (URLError, OSError) as exc:
+            raise CommandError(f"{base_url}: {exc}")
+
+    def _run_target(self, base_url, enrollment_ids, options):
+        stats = {'requests': 0, 'errors': 0, 'read_ms': [], 'write_ms': []}
+        lock = threading.Lock()
+        local = threading.local()
+
+        def operation(i):
+            if not hasattr(local, 'client'):
+                local.client = _Client(base_url, options['timeout'])
+                local.rng = random.Random(i)
+            rng = local.rng
+            enrollment_id = rng.choice(enrollment_ids)
+            if rng.random() < options['write_ratio']:
+                timings, errors = local.client.add_and_delete_note(enrollment_id)
+                kind = 'write_ms'
+            else:
+                timings, errors = local.client.load_notes(enrollment_id)
+                kind = 'read_ms'
+            with lock:
+                stats['requests'] += len(timings) + errors
+                stats['errors'] += errors
+                stats[kind].extend(timings)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(operation, range(options['requests'])))
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+
+class _Client:
+    """
+    One simulated browser: keeps its cookies and sends the CSRF token on POSTs.
+
+    ``base_url`` may end in SYNC_PREFIX, which is put in front of every path.
+    """
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies))
+
+    def _request(self, path, data=None):
+        headers = {'HX-Request': 'true', 'Referer': self.base_url + '/'}
+        if data is not None:
+            headers['X-CSRFToken'] = next((c.value for c in self.cookies if c.name == 'csrftoken'), '')
+            data = urlencode(data).encode()
+        start = time.perf_counter()
+        with self.opener.open(Request(self.base_url + path, data=data, headers=headers), timeout=self.timeout) as resp:
+            body = resp.read().decode()
+        return body, (time.perf_counter() - start) * 1000
+
+    def load_notes(self, enrollment_id, raise_errors=False):
+        try:
+            _, elapsed = self._request(reverse('load_notes_for_class', args=[enrollment_id]))
+        except (HTTPError, URLError, OSError):
+            if raise_errors:
+                raise
+            return [], 1
+        return [elapsed], 0
+
+    def add_and_delete_note(self, enrollment_id):
+        """Add a note and delete it again so repeated runs leave the data as it was."""
+        try:
+            if not any(c.name == 'csrftoken' for c in self.cookies):
+                self.load_notes(enrollment_id)
+            body, added = self._request(
+                reverse('add_note', args=[enrollment_id]), {'content': "Load test note"},
+            )
+            match = NOTE_ID_RE.search(body)
+            if not match:
+                return [added], 1
+            _, deleted = self._request(reverse('delete_note', args=[match.group(1)]), {})
+        except (HTTPError, URLError, OSError):
+            return [], 1
+        return [added, deleted], 0
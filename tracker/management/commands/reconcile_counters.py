@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from tracker.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute Class.student_count and Enrollment.note_count from the actual rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows updated per transaction.")
+
+    def handle(self, *args, batch_size, **options):
+        fixed = reconcile_counters(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f"Corrected {fixed['student_count']} class student counts and "
+            f"{fixed['note_count']} enrollment note counts."
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from tracker.analytics import refresh_class_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the class analytics rollups for classes changed since the "
+        "last run (run it from cron; the first run covers every class)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute every class.")
+        parser.add_argument('--class-id', type=int, action='append', dest='class_ids', help="Only these classes.")
+
+    def handle(self, *args, full, class_ids, **options):
+        refreshed = refresh_class_stats(full=full, class_ids=class_ids)
+        self.stdout.write(self.style.SUCCESS(f"Refreshed stats of {refreshed} classes."))
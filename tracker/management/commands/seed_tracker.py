@@ -0,0 +1,106 @@
+import random
+import secrets
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.counters import adjust_student_counts
+from tracker.models import Class, Enrollment, Note, Student
+
+
+FIRST_NAMES = (
+    'Akmal', 'Aziz', 'Bekzod', 'Dilnoza', 'Dilshod', 'Gulnora', 'Jasur', 'Kamola',
+    'Laylo', 'Madina', 'Nodir', 'Otabek', 'Sardor', 'Shahnoza', 'Umid', 'Zarina',
+)
+LAST_NAMES = (
+    'Aliyev', 'Karimov', 'Norqulov', 'Rahimov', 'Saidova', 'Tursunov', 'Usmonova',
+    'Xolmatov', 'Yusupov', "Qodirov", "Ergasheva", "Mirzayev",
+)
+SUBJECTS = ('Matematika', 'Fizika', 'Kimyo', 'Biologiya', 'Tarix', 'Ingliz tili', 'Informatika')
+NOTE_TEXTS = (
+    "Uy vazifasini bajarmadi.", "Darsda faol qatnashdi.", "Imtihonni o'tkazib yubordi.",
+    "Nazorat ishidan a'lo baho oldi.", "Darsga kechikdi.", "Ota-onasi bilan suhbat o'tkazildi.",
+)
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic classes, students, enrollments and notes with bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--classes', type=int, default=20)
+        parser.add_argument('--students', type=int, default=1000)
+        parser.add_argument('--classes-per-student', type=int, default=3)
+        parser.add_argument('--notes-per-enrollment', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=1000, help="Students written per transaction.")
+        parser.add_argument('--seed', type=int, help="Random seed for reproducible data.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        tag = secrets.token_hex(3)
+
+        classes = Class.objects.bulk_create([
+            Class(
+                name=f"{SUBJECTS[i % len(SUBJECTS)]} {i + 1} ({tag})",
+                subject=SUBJECTS[i % len(SUBJECTS)],
+                description=f"Synthetic class #{i + 1}",
+            )
+            for i in range(options['classes'])
+        ])
+        per_student = min(options['classes_per_student'], len(classes))
+
+        totals = {'students': 0, 'enrollments': 0, 'notes': 0}
+        remaining = options['students']
+        while remaining > 0:
+            size = min(options['batch_size'], remaining)
+            remaining -= size
+            with transaction.atomic():
+                self._seed_batch(rng, now, size, classes, per_student, options['notes_per_enrollment'], totals)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(classes)} classes, {totals['students']} students, "
+            f"{totals['enrollments']} enrollments and {totals['notes']} notes."
+        ))
+
+    def _seed_batch(self, rng, now, size, classes, per_student, notes_per_enrollment, totals):
+        students = Student.objects.bulk_create([
+            Student(
+                full_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                email=f"student{rng.randrange(10 ** 9)}@example.com",
+                phone=f"+998 9{rng.randrange(10 ** 8):08d}",
+                age=rng.randint(7, 18),
+                created_at=now - timedelta(days=rng.randint(0, 730)),
+            )
+            for _ in range(size)
+        ])
+
+        enrollments = Enrollment.objects.bulk_create([
+            Enrollment(
+                student=student,
+                classroom=classroom,
+                joined_at=now - timedelta(days=rng.randint(0, 365)),
+                note_count=notes_per_enrollment,
+            )
+            for student in students
+            for classroom in rng.sample(classes, per_student)
+        ])
+
+        notes = Note.objects.bulk_create(
+            [
+                Note(
+                    enrollment=enrollment,
+                    content=rng.choice(NOTE_TEXTS),
+                    created_at=now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440)),
+                )
+                for enrollment in enrollments
+                for _ in range(notes_per_enrollment)
+            ],
+            batch_size=5000,
+        )
+        adjust_student_counts(e.classroom_id for e in enrollments)
+
+        totals['students'] += len(students)
+        totals['enrollments'] += len(enrollments)
+        totals['notes'] += len(notes)
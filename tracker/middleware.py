@@ -0,0 +1,105 @@
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+from . import timing
+from .routers import PIN_COOKIE, PIN_SECONDS, replica_configured
+
+
+logger = logging.getLogger('tracker.timing')
+
+
+# ======================================================
+# ⏱ QUERY COUNT & TIMING MIDDLEWARE
+# ======================================================
+class QueryTimingMiddleware:
+    """
+    Measure SQL queries, DB time, template time and remaining Python time for
+    every request, expose them as a Server-Timing header and aggregate them
+    per resolved URL name (see the ``timing_stats`` view).
+
+    Requests slower than ``TRACKER_SLOW_REQUEST_MS`` are logged as warnings.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'TRACKER_SLOW_REQUEST_MS', 500)
+        # Stay async under ASGI so async views are not pushed onto a thread
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings, token = timing.start_request()
+        start = perf_counter()
+        try:
+            with self._wrap_connections(timings):
+                response = self.get_response(request)
+        finally:
+            timing.end_request(token)
+        return self._finish(request, response, timings, perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings, token = timing.start_request()
+        start = perf_counter()
+        # Async ORM calls run in the request's thread-sensitive executor
+        # thread, whose connections are not the event loop thread's, so the
+        # wrappers are installed (and removed) there.
+        stack = await sync_to_async(self._wrap_connections)(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            timing.end_request(token)
+        return self._finish(request, response, timings, perf_counter() - start)
+
+    def _wrap_connections(self, timings):
+        stack = ExitStack()
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(timings.db_wrapper))
+        return stack
+
+    def _finish(self, request, response, timings, total):
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match else 'unresolved'
+        timing.record(name, total, timings)
+
+        python = timing.python_time(total, timings)
+        response['Server-Timing'] = (
+            f'db;dur={timings.db_time * 1000:.1f};desc="{timings.queries} queries", '
+            f'tpl;dur={timings.template_time * 1000:.1f}, '
+            f'app;dur={python * 1000:.1f}, '
+            f'total;dur={total * 1000:.1f}'
+        )
+
+        log = logger.warning if total * 1000 >= self.slow_ms else logger.debug
+        log(
+            "%s %s -> %s %.1fms (db %.1fms / %d queries, templates %.1fms, python %.1fms)",
+            request.method, name, response.status_code, total * 1000,
+            timings.db_time * 1000, timings.queries, timings.template_time * 1000, python * 1000,
+        )
+        return response
+
+
+# ======================================================
+# 📌 PIN WRITERS TO THE PRIMARY DATABASE
+# ======================================================
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """
+    After a write request, keep the browser's read-only views on 'default'
+    for a few seconds (see tracker.routers), so it reads its own writes.
+    """
+
+    def process_response(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and replica_configured():
+            response.set_cookie(PIN_COOKIE, '1', max_age=PIN_SECONDS, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from tracker.search import install_fts, uninstall_fts
+
+
+def forwards(apps, schema_editor):
+    install_fts(schema_editor)
+
+
+def backwards(apps, schema_editor):
+    uninstall_fts(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_student_address'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
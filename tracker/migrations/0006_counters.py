@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:53
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Class = apps.get_model('tracker', 'Class')
+    Enrollment = apps.get_model('tracker', 'Enrollment')
+    Note = apps.get_model('tracker', 'Note')
+
+    def count_of(model, fk):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(**{fk: OuterRef('pk')})
+                .order_by()
+                .values(fk)
+                .annotate(n=Count('*'))
+                .values('n')
+            ),
+            0,
+        )
+
+    Class.objects.update(student_count=count_of(Enrollment, 'classroom'))
+    Enrollment.objects.update(note_count=count_of(Note, 'enrollment'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='class',
+            name='student_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='note_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_sync'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ClassStatsSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_count', models.PositiveIntegerField(default=0)),
+                ('note_count', models.PositiveIntegerField(default=0)),
+                ('most_notes', models.JSONField(default=list)),
+                ('fewest_notes', models.JSONField(default=list)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('classroom', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats_summary', to='tracker.class')),
+            ],
+            options={
+                'verbose_name_plural': 'Class stats summaries',
+            },
+        ),
+        migrations.CreateModel(
+            name='ClassWeeklyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField(help_text='Monday of the week')),
+                ('students_joined', models.PositiveIntegerField(default=0)),
+                ('notes_written', models.PositiveIntegerField(default=0)),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_stats', to='tracker.class')),
+            ],
+            options={
+                'verbose_name_plural': 'Class weekly stats',
+                'ordering': ['classroom', 'week'],
+                'unique_together': {('classroom', 'week')},
+            },
+        ),
+    ]
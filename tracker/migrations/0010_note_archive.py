@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_class_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='class',
+            name='ended_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ArchivedNote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('note_id', models.PositiveBigIntegerField(help_text='Id the note had in Note', unique=True)),
+                ('compressed_content', models.BinaryField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('enrollment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notes', to='tracker.enrollment')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['enrollment', '-updated_at', '-id'], name='archived_note_recent_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+import zlib
+
 from django.db import models
 from django.utils import timezone
 
@@ -10,11 +12,20 @@ class Class(models.Model):
     subject = models.CharField(max_length=100, blank=True)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set when the class is over; its notes become eligible for archival
+    ended_at = models.DateTimeField(blank=True, null=True)
+    # Denormalized, kept up to date by tracker.counters
+    student_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         verbose_name = "Class"
         verbose_name_plural = "Classes"
         ordering = ['name']
+        indexes = [
+            # Delta sync: rows changed since a cursor
+            models.Index(fields=['updated_at', 'id'], name='class_sync_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -30,6 +41,7 @@ class Student(models.Model):
     age = models.PositiveIntegerField(blank=True, null=True)
     birth_date = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     address = models.TextField(blank=True, null=True)
 
     # Many-to-many through Enrollment
@@ -37,6 +49,11 @@ class Student(models.Model):
 
     class Meta:
         ordering = ['full_name']
+        indexes = [
+            # Directory listing and its keyset pagination on (full_name, id)
+            models.Index(fields=['full_name', 'id'], name='student_name_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='student_sync_idx'),
+        ]
 
     def __str__(self):
         return self.full_name
@@ -53,10 +70,18 @@ class Enrollment(models.Model):
         Class, on_delete=models.CASCADE, related_name='enrollments'
     )
     joined_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized, kept up to date by tracker.counters
+    note_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         unique_together = ('student', 'classroom')
         ordering = ['classroom__name', 'student__full_name']
+        indexes = [
+            # Class rosters, oldest enrollment first
+            models.Index(fields=['classroom', 'joined_at'], name='enrollment_class_joined_idx'),
+            models.Index(fields=['updated_at', 'id'], name='enrollment_sync_idx'),
+        ]
         verbose_name = "Enrollment"
         verbose_name_plural = "Enrollments"
 
@@ -77,6 +102,11 @@ class Note(models.Model):
 
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # One enrollment's notes, newest first (id breaks updated_at ties)
+            models.Index(fields=['enrollment', '-updated_at', '-id'], name='note_enrollment_recent_idx'),
+            models.Index(fields=['updated_at', 'id'], name='note_sync_idx'),
+        ]
         verbose_name = "Note"
         verbose_name_plural = "Notes"
 
@@ -89,3 +119,97 @@ class Note(models.Model):
             if len(self.content) > 50
             else self.content
         )
+
+
+# ======================================================
+# 🗄 ARCHIVED NOTE (moved out of Note by archive_notes)
+# ======================================================
+class ArchivedNote(models.Model):
+    """An old note kept zlib-compressed outside the hot Note table."""
+    note_id = models.PositiveBigIntegerField(unique=True, help_text="Id the note had in Note")
+    enrollment = models.ForeignKey(
+        Enrollment, on_delete=models.CASCADE, related_name='archived_notes'
+    )
+    compressed_content = models.BinaryField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['enrollment', '-updated_at', '-id'], name='archived_note_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived note #{self.note_id}"
+
+    @property
+    def content(self):
+        return zlib.decompress(self.compressed_content).decode()
+
+    @staticmethod
+    def compress(content):
+        return zlib.compress(content.encode(), 6)
+
+
+# ======================================================
+# 📊 CLASS ANALYTICS ROLLUPS
+# ======================================================
+# Precomputed by the refresh_class_stats command (tracker.analytics);
+# dashboards read these rows instead of aggregating enrollments and notes.
+class ClassWeeklyStats(models.Model):
+    classroom = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='weekly_stats')
+    week = models.DateField(help_text="Monday of the week")
+    students_joined = models.PositiveIntegerField(default=0)
+    notes_written = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('classroom', 'week')
+        ordering = ['classroom', 'week']
+        verbose_name_plural = "Class weekly stats"
+
+    def __str__(self):
+        return f"{self.classroom.name} — {self.week}"
+
+
+class ClassStatsSummary(models.Model):
+    classroom = models.OneToOneField(Class, on_delete=models.CASCADE, related_name='stats_summary')
+    student_count = models.PositiveIntegerField(default=0)
+    note_count = models.PositiveIntegerField(default=0)
+    # [{"student_id": 1, "full_name": "...", "note_count": 3}, ...]
+    most_notes = models.JSONField(default=list)
+    fewest_notes = models.JSONField(default=list)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name_plural = "Class stats summaries"
+
+    def __str__(self):
+        return f"{self.classroom.name} stats"
+
+
+class RollupWatermark(models.Model):
+    """How far a rollup has processed changed rows (by updated_at)."""
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.value:%Y-%m-%d %H:%M:%S}"
+
+
+# ======================================================
+# 🪦 TOMBSTONE (deletions, for delta sync)
+# ======================================================
+class Tombstone(models.Model):
+    """Records that a row was deleted, so syncing clients can drop their copy."""
+    model = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
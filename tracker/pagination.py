@@ -0,0 +1,117 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+# ======================================================
+# 🔑 KEYSET (CURSOR) PAGINATION
+# ======================================================
+# Pages are addressed by the sort key of the last row already shown instead
+# of an OFFSET, so fetching page N costs the same as fetching page 1.
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder cuts datetimes to milliseconds, which would make the
+    # key fall between rows written within the same millisecond.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values):
+    """Pack the sort key of the last row into an opaque URL-safe token."""
+    raw = json.dumps(list(values), cls=_CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Return the list of values stored in ``cursor`` or None if it is invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != size:
+        return None
+    return values
+
+
+def cursor_values(model, ordering, values):
+    """
+    ``values`` converted by the ``ordering`` fields of ``model``, or None if
+    any of them does not fit its field (a tampered or outdated cursor).
+    """
+    coerced = []
+    try:
+        for name, value in zip(ordering, values):
+            field = model._meta.get_field(name.lstrip('-'))
+            value = field.to_python(value)
+            if value is None:
+                return None
+            # Range and length checks, e.g. an id too large for SQLite
+            field.run_validators(value)
+            coerced.append(value)
+    except (ValueError, TypeError, ValidationError):
+        return None
+    return coerced
+
+
+def keyset_filter(ordering, values):
+    """
+    Build a Q matching rows that sort strictly after ``values``.
+
+    ``ordering`` uses the usual Django syntax, so ('full_name', 'id') gives
+    ``full_name > a OR (full_name = a AND id > b)``.
+    """
+    condition = Q()
+    for i in reversed(range(len(ordering))):
+        field = ordering[i].lstrip('-')
+        lookup = 'lt' if ordering[i].startswith('-') else 'gt'
+        step = Q(**{f'{field}__{lookup}': values[i]})
+        if i < len(ordering) - 1:
+            step |= Q(**{field: values[i]}) & condition
+        condition = step
+    return condition
+
+
+def _page_from_rows(rows, ordering, page_size):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, f.lstrip('-')) for f in ordering)
+    return rows, next_cursor
+
+
+def _keyset_queryset(queryset, ordering, cursor, page_size):
+    values = decode_cursor(cursor, len(ordering))
+    if values is not None:
+        values = cursor_values(queryset.model, ordering, values)
+    if values is not None:
+        queryset = queryset.filter(keyset_filter(ordering, values))
+    return queryset.order_by(*ordering)[:page_size + 1]
+
+
+def paginate_keyset(queryset, ordering, cursor=None, page_size=50):
+    """
+    Return ``(rows, next_cursor)`` for the page that follows ``cursor``.
+
+    ``ordering`` must end with a unique field (usually ``id``) so the key is
+    total. ``next_cursor`` is None on the last page.
+    """
+    rows = list(_keyset_queryset(queryset, ordering, cursor, page_size))
+    return _page_from_rows(rows, ordering, page_size)
+
+
+async def apaginate_keyset(queryset, ordering, cursor=None, page_size=50):
+    """Async counterpart of :func:`paginate_keyset` for async views."""
+    rows = [row async for row in _keyset_queryset(queryset, ordering, cursor, page_size)]
+    return _page_from_rows(rows, ordering, page_size)
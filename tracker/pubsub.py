@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+# ======================================================
+# 📡 IN-PROCESS PUB/SUB (live note updates)
+# ======================================================
+# Note changes are published per enrollment channel and fanned out to the
+# server-sent event streams of that enrollment. The broker class is looked
+# up from settings.TRACKER_PUBSUB_BROKER, so a multi-process deployment can
+# plug in a shared backend (e.g. Redis) with the same publish/subscribe API.
+
+DEFAULT_BROKER = 'tracker.pubsub.InMemoryBroker'
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def enrollment_channel(enrollment_id):
+    return f'enrollment-{enrollment_id}'
+
+
+class Subscription:
+    """Async iterator over the messages of one channel; close() unsubscribes."""
+
+    def __init__(self, broker, channel, queue):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    async def get(self, timeout=None):
+        """Next message, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """
+    Fan-out within one process.
+
+    publish() may be called from any thread (sync views, the async ORM's
+    executor thread); each message is handed to the subscriber's own event
+    loop with call_soon_threadsafe. Subscribers that fall more than
+    SUBSCRIBER_QUEUE_SIZE messages behind miss the overflow instead of
+    growing without bound.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(dict)
+
+    def subscribe(self, channel):
+        """Must be called from the event loop that will consume the messages."""
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        subscription = Subscription(self, channel, queue)
+        with self._lock:
+            self._subscribers[channel][subscription] = asyncio.get_running_loop()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel, {})
+            subscribers.pop(subscription, None)
+            if not subscribers:
+                self._subscribers.pop(subscription.channel, None)
+
+    def publish(self, channel, message):
+        with self._lock:
+            targets = list(self._subscribers.get(channel, {}).items())
+        for subscription, loop in targets:
+            try:
+                loop.call_soon_threadsafe(_offer, subscription.queue, message)
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, {}))
+
+
+def _offer(queue, message):
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        pass
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'TRACKER_PUBSUB_BROKER', DEFAULT_BROKER))()
+    return _broker
+
+
+# ------------------------------------------------------
+# Note events
+# ------------------------------------------------------
+def note_saved_message(note):
+    """Plain data, so it survives a broker that serializes messages."""
+    return {
+        'event': 'note-saved',
+        'id': note.id,
+        'content': note.content,
+        'updated_at': note.updated_at.isoformat(),
+    }
+
+
+def note_deleted_message(note_id):
+    return {'event': 'note-deleted', 'id': note_id}
+
+
+def publish_note_event(enrollment_id, message):
+    get_broker().publish(enrollment_channel(enrollment_id), message)
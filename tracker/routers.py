@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+# ======================================================
+# 📖 READ-ONLY CONNECTION ROUTING
+# ======================================================
+# Views decorated with @read_only send their queries to the 'replica' alias
+# (in the production profile a second, mode=ro connection over the same WAL
+# file), so page loads never queue behind note writes on 'default'.
+# Everything else, and every write, uses 'default'.
+#
+# After a POST the browser gets a short-lived PIN_COOKIE, and its read-only
+# requests stay on 'default' until it expires. The HTMX refresh that follows
+# add_note then sees the new note even with a replica that lags behind.
+
+REPLICA_ALIAS = 'replica'
+PIN_COOKIE = 'tracker_primary'
+PIN_SECONDS = 5
+
+_use_replica = ContextVar('tracker_use_replica', default=False)
+
+
+def replica_configured():
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return False
+    # Under the test runner the replica is a TEST['MIRROR'] of 'default'
+    # pointing at the same database, without sight of TestCase's
+    # uncommitted rows; reads stay on 'default' there.
+    return connections[REPLICA_ALIAS].settings_dict['NAME'] != connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+
+
+def wants_replica(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and PIN_COOKIE not in request.COOKIES
+        and replica_configured()
+    )
+
+
+@contextmanager
+def reading_from_replica(enabled=True):
+    token = _use_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def read_only(view):
+    """Run the view's reads on the replica (sync and async views)."""
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            # The context is copied into sync_to_async threads, so the async
+            # ORM's queries see the flag too.
+            with reading_from_replica(wants_replica(request)):
+                return await view(request, *args, **kwargs)
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with reading_from_replica(wants_replica(request)):
+                return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explicit, otherwise an instance read from the replica would be
+        # saved back through it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
@@ -0,0 +1,164 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Enrollment, Note, Student
+
+
+# ======================================================
+# 🔎 FULL-TEXT SEARCH (SQLite FTS5)
+# ======================================================
+# Students and notes are mirrored into external-content FTS5 tables that
+# SQLite keeps in sync with triggers, so every write path (views, admin,
+# bulk_create, raw updates) updates the index without extra Python work.
+
+FTS_TABLES = {
+    'tracker_student_fts': ('tracker_student', ('full_name', 'email', 'phone')),
+    'tracker_note_fts': ('tracker_note', ('content',)),
+}
+
+
+def _create_table_sql(fts_table, source, columns):
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{', '.join(columns)}, content='{source}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def _trigger_sql(fts_table, source, columns):
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+    insert = f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new});"
+    delete = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {source} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {source} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {cols} ON {source} "
+        f"BEGIN {delete} {insert} END",
+    ]
+
+
+def install_fts(schema_editor):
+    """Create the FTS tables and triggers and index the existing rows."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for fts_table, (source, columns) in FTS_TABLES.items():
+        schema_editor.execute(_create_table_sql(fts_table, source, columns))
+        for sql in _trigger_sql(fts_table, source, columns):
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def uninstall_fts(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for fts_table in FTS_TABLES:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+
+
+def ensure_fts_triggers(using='default', **kwargs):
+    """
+    Re-create the sync triggers after migrations.
+
+    SQLite migrations that rebuild ``tracker_student`` or ``tracker_note``
+    (e.g. adding a NOT NULL column) drop the triggers with the old table.
+    """
+    from django.db import connections
+
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (%s, %s)",
+            list(FTS_TABLES),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        for fts_table, (source, columns) in FTS_TABLES.items():
+            if fts_table in existing:
+                for sql in _trigger_sql(fts_table, source, columns):
+                    cursor.execute(sql)
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def to_match_query(text):
+    """Turn free user input into an FTS5 query of quoted prefix terms."""
+    terms = re.findall(r'\w+', text or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def _match_ids(fts_table, match):
+    return RawSQL(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s", [match])
+
+
+def _ranked_ids(fts_table, match, limit):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s ORDER BY rank LIMIT %s",
+            [match, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def student_queryset(text):
+    """Students matching ``text``, as an indexed subquery filter."""
+    match = to_match_query(text)
+    if not match:
+        return Student.objects.none()
+    if not fts_enabled():
+        return Student.objects.filter(
+            Q(full_name__icontains=text) | Q(email__icontains=text) | Q(phone__icontains=text)
+        )
+    return Student.objects.filter(id__in=_match_ids('tracker_student_fts', match))
+
+
+def note_queryset(text):
+    """Notes whose content matches ``text``."""
+    match = to_match_query(text)
+    if not match:
+        return Note.objects.none()
+    if not fts_enabled():
+        return Note.objects.filter(content__icontains=text)
+    return Note.objects.filter(id__in=_match_ids('tracker_note_fts', match))
+
+
+def search_students(text, limit=20):
+    """Best-ranked students for ``text``."""
+    match = to_match_query(text)
+    if not match or not fts_enabled():
+        return list(student_queryset(text)[:limit])
+    ids = _ranked_ids('tracker_student_fts', match, limit)
+    found = Student.objects.in_bulk(ids)
+    return [found[i] for i in ids if i in found]
+
+
+def search_notes(text, limit=20):
+    """Best-ranked notes for ``text`` with their student and class loaded."""
+    queryset = Note.objects.select_related('enrollment__student', 'enrollment__classroom')
+    match = to_match_query(text)
+    if not match or not fts_enabled():
+        return list(queryset.filter(id__in=note_queryset(text).values('id'))[:limit])
+    ids = _ranked_ids('tracker_note_fts', match, limit)
+    found = queryset.in_bulk(ids)
+    return [found[i] for i in ids if i in found]
+
+
+def enrollment_queryset(text):
+    """Enrollments whose student matches ``text`` or whose class name contains it."""
+    return Enrollment.objects.filter(
+        Q(student__in=student_queryset(text)) | Q(classroom__name__icontains=text)
+    )
@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_class_list_generation, bump_student_versions
+from .counters import adjust_note_count, adjust_student_count
+from .models import Class, Enrollment, Note, Student
+from .pubsub import note_deleted_message, note_saved_message, publish_note_event
+from .sync import record_tombstone
+
+
+# ======================================================
+# 📘 CLASS CHANGES → home page cache
+# ======================================================
+# Bump after commit: a grid rendered by another request before the commit
+# (still showing the old rows) is left behind under the previous generation.
+@receiver(post_save, sender=Class)
+@receiver(post_delete, sender=Class)
+def class_changed(sender, **kwargs):
+    transaction.on_commit(bump_class_list_generation)
+
+
+# ======================================================
+# 🧍 STUDENT / ENROLLMENT / CLASS CHANGES → directory rows
+# ======================================================
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def student_changed(sender, instance, **kwargs):
+    student_id = instance.id  # cleared on the instance once a delete finishes
+    transaction.on_commit(lambda: bump_student_versions([student_id]))
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_changed(sender, instance, **kwargs):
+    student_id = instance.student_id
+    transaction.on_commit(lambda: bump_student_versions([student_id]))
+
+
+@receiver(post_save, sender=Class)
+def class_renamed(sender, instance, created, **kwargs):
+    # Saves other than creation are edits that may rename the class; every
+    # student row showing it needs re-rendering. (Deletes cascade through
+    # Enrollment, which bumps its students already.)
+    if not created:
+        student_ids = list(instance.enrollments.values_list('student_id', flat=True))
+        transaction.on_commit(lambda: bump_student_versions(student_ids))
+
+
+# ======================================================
+# 📝 NOTE CHANGES → live note streams
+# ======================================================
+@receiver(post_save, sender=Note)
+def note_saved(sender, instance, **kwargs):
+    message = note_saved_message(instance)
+    transaction.on_commit(lambda: publish_note_event(instance.enrollment_id, message))
+
+
+@receiver(post_delete, sender=Note)
+def note_deleted(sender, instance, **kwargs):
+    message = note_deleted_message(instance.id)
+    transaction.on_commit(lambda: publish_note_event(instance.enrollment_id, message))
+
+
+# ======================================================
+# 🔢 ROW CHANGES → denormalized counters
+# ======================================================
+# Single-row creates and every delete (views, admin, cascades) are counted
+# here, inside the writing transaction. bulk_create sends no signals; the
+# bulk paths adjust the counters themselves. Rows removed together with the
+# row that holds their counter are skipped: that counter is deleted too.
+def _removed_with(origin, *models):
+    """Whether the delete started from an instance or queryset of ``models``."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in models
+
+
+@receiver(post_save, sender=Enrollment)
+def enrollment_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_student_count(instance.classroom_id)
+
+
+@receiver(post_delete, sender=Enrollment)
+def enrollment_removed(sender, instance, origin=None, **kwargs):
+    if not _removed_with(origin, Class):
+        adjust_student_count(instance.classroom_id, -1)
+
+
+@receiver(post_save, sender=Note)
+def note_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_note_count(instance.enrollment_id)
+
+
+@receiver(post_delete, sender=Note)
+def note_removed(sender, instance, origin=None, **kwargs):
+    if not _removed_with(origin, Enrollment, Student, Class):
+        adjust_note_count(instance.enrollment_id, -1)
+
+
+# ======================================================
+# 🪦 DELETIONS → tombstones for delta sync
+# ======================================================
+# Written in the deleting transaction, so a rolled back delete leaves none.
+@receiver(post_delete, sender=Class)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Enrollment)
+@receiver(post_delete, sender=Note)
+def record_deletion(sender, instance, **kwargs):
+    record_tombstone(instance)
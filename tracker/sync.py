@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Class, Enrollment, Note, Student, Tombstone
+from .pagination import cursor_values, decode_cursor, encode_cursor, keyset_filter
+
+
+# ======================================================
+# 🔄 DELTA SYNC (offline clients)
+# ======================================================
+# Each model is read in (updated_at, id) order from its own position, kept
+# together in one opaque cursor, so a reconnecting client only receives the
+# rows changed since its last pull plus tombstones for deleted rows. Every
+# model is paged independently: a note may arrive a page before its
+# enrollment.
+
+SYNC_PAGE_SIZE = 500
+SYNC_MAX_PAGE_SIZE = 2000
+
+# Rows stamped within the last few seconds may still belong to transactions
+# that have not committed; they are left for the next pull so a cursor never
+# moves past a row the client has not seen.
+SYNC_SETTLE_SECONDS = 2
+
+SYNC_MODELS = (
+    ('classes', Class, 'updated_at', (
+        'id', 'name', 'subject', 'description', 'student_count', 'created_at', 'updated_at',
+    )),
+    ('students', Student, 'updated_at', (
+        'id', 'full_name', 'email', 'phone', 'age', 'birth_date', 'address', 'created_at', 'updated_at',
+    )),
+    ('enrollments', Enrollment, 'updated_at', (
+        'id', 'student_id', 'classroom_id', 'joined_at', 'note_count', 'updated_at',
+    )),
+    ('notes', Note, 'updated_at', (
+        'id', 'enrollment_id', 'content', 'created_at', 'updated_at',
+    )),
+    ('deleted', Tombstone, 'deleted_at', (
+        'id', 'model', 'object_id', 'deleted_at',
+    )),
+)
+
+# Model → name recorded in Tombstone.model
+TOMBSTONE_NAMES = {Class: 'class', Student: 'student', Enrollment: 'enrollment', Note: 'note'}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _positions(cursor):
+    if not cursor:
+        return [None] * len(SYNC_MODELS)
+    positions = decode_cursor(cursor, len(SYNC_MODELS))
+    if positions is None:
+        raise InvalidCursor("Invalid sync cursor")
+    coerced = []
+    for (key, model, stamp, fields), position in zip(SYNC_MODELS, positions):
+        if position is not None:
+            # A timestamp and an id, each of which must fit its field
+            if not isinstance(position, list) or len(position) != 2:
+                raise InvalidCursor("Invalid sync cursor")
+            position = cursor_values(model, (stamp, 'id'), position)
+            if position is None:
+                raise InvalidCursor("Invalid sync cursor")
+        coerced.append(position)
+    return coerced
+
+
+def changes_since(cursor=None, page_size=SYNC_PAGE_SIZE):
+    """
+    Return the next page of changes after ``cursor`` (None for everything).
+
+    The result has one list of rows per model, ``deleted`` tombstones, the
+    ``cursor`` to send next time and ``has_more`` while any model still has
+    rows left.
+    """
+    positions = _positions(cursor)
+    until = timezone.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    changes = {}
+    next_positions = []
+    has_more = False
+
+    for (key, model, stamp, fields), position in zip(SYNC_MODELS, positions):
+        ordering = (stamp, 'id')
+        rows = model.objects.filter(**{f'{stamp}__lt': until})
+        if position is not None:
+            rows = rows.filter(keyset_filter(ordering, position))
+        rows = list(rows.order_by(*ordering).values(*fields)[:page_size + 1])
+
+        if len(rows) > page_size:
+            has_more = True
+            rows = rows[:page_size]
+        changes[key] = rows
+        next_positions.append([rows[-1][stamp], rows[-1]['id']] if rows else position)
+
+    changes['cursor'] = encode_cursor(next_positions)
+    changes['has_more'] = has_more
+    return changes
+
+
+def record_tombstone(instance):
+    Tombstone.objects.create(model=TOMBSTONE_NAMES[type(instance)], object_id=instance.pk)
@@ -1,3 +1,1177 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import re
+import sqlite3
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, router
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import caching, importer, search, timing, views
+from .backup import backup_database, rotate_backups
+from .benchmark import run_benchmarks
+from .admin import EstimatedCountPaginator
+from .analytics import WATERMARK_NAME, WATERMARK_OVERLAP, changed_class_ids, refresh_class_stats
+from .archive import archivable_notes, archive_batch, archive_notes
+from .counters import reconcile_counters
+from .enrollments import broadcast_note, resolve_roster
+from .models import (
+    ArchivedNote, Class, ClassStatsSummary, Enrollment, Note, RollupWatermark, Student, Tombstone,
+)
+from .pagination import encode_cursor
+from .pubsub import enrollment_channel, get_broker
+from .routers import PIN_COOKIE, REPLICA_ALIAS, read_only
+from .sync import SYNC_SETTLE_SECONDS
+from .views import NOTES_PAGE_SIZE
+
+
+# ======================================================
+# ⏱ SEED DATA & VIEW BENCHMARKS
+# ======================================================
+class SeedTrackerTests(TestCase):
+    def test_seed_creates_requested_volumes(self):
+        call_command(
+            'seed_tracker', classes=4, students=25, classes_per_student=2,
+            notes_per_enrollment=3, batch_size=10, seed=1, stdout=StringIO(),
+        )
+        self.assertEqual(Class.objects.count(), 4)
+        self.assertEqual(Student.objects.count(), 25)
+        self.assertEqual(Enrollment.objects.count(), 50)
+        self.assertEqual(Note.objects.count(), 150)
+
+
+class BenchmarkBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'seed_tracker', classes=5, students=60, classes_per_student=2,
+            notes_per_enrollment=4, seed=1, stdout=StringIO(),
+        )
+
+    def test_every_view_within_budget(self):
+        results = run_benchmarks(iterations=3, warmup=1)
+        measured = {r.name for r in results if not r.skipped}
+        self.assertTrue({
+            'class_list', 'class_detail', 'all_students',
+            'global_student_detail', 'load_notes_for_class',
+        } <= measured)
+        for r in results:
+            with self.subTest(url=r.name):
+                self.assertEqual(r.failures, [])
+
+    @override_settings(TRACKER_BENCHMARK_BUDGETS={'class_detail': {'queries': 0}})
+    def test_budget_overrun_is_reported(self):
+        [result] = run_benchmarks(iterations=1, warmup=0, names=['class_detail'])
+        self.assertIn("2 queries > 0", result.failures)
+
+    @override_settings(TRACKER_BENCHMARK_BUDGETS={'class_detail': {'queries': 1}})
+    def test_command_fails_when_budget_exceeded(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_tracker', 'class_detail', iterations=1, stdout=StringIO())
+
+
+# ======================================================
+# ⏱ REQUEST TIMING
+# ======================================================
+SERVER_TIMING_RE = re.compile(
+    r'db;dur=(?P<db>[\d.]+);desc="(?P<queries>\d+) queries", tpl;dur=(?P<tpl>[\d.]+), '
+    r'app;dur=(?P<app>[\d.]+), total;dur=(?P<total>[\d.]+)'
+)
+
+
+class RequestTimingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Informatika 1")
+        Enrollment.objects.create(student=Student.objects.create(full_name="Oybek Tursunov"), classroom=cls.classroom)
+        cls.staff = User.objects.create_user('admin', password='parol', is_staff=True)
+
+    def setUp(self):
+        timing.reset()
+        self.addCleanup(timing.reset)
+
+    def test_server_timing_header(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('class_detail', args=[self.classroom.id]))
+        match = SERVER_TIMING_RE.fullmatch(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        self.assertEqual(int(match['queries']), len(ctx.captured_queries))
+        db, tpl, app, total = (float(match[k]) for k in ('db', 'tpl', 'app', 'total'))
+        self.assertGreater(tpl, 0)
+        # Rounded to 0.1 ms each
+        self.assertAlmostEqual(db + tpl + app, total, delta=0.2)
+
+    def test_stats_aggregate_per_view(self):
+        for _ in range(3):
+            self.client.get(reverse('class_detail', args=[self.classroom.id]))
+        self.client.get(reverse('class_list'))
+
+        self.client.force_login(self.staff)
+        views = {row['url_name']: row for row in self.client.get(reverse('timing_stats')).json()['views']}
+        detail = views['class_detail']
+        self.assertEqual(detail['requests'], 3)
+        self.assertEqual(detail['avg_queries'], detail['max_queries'])
+        self.assertLessEqual(detail['avg_ms'], detail['max_ms'])
+        self.assertEqual(views['class_list']['requests'], 1)
+
+        self.client.post(reverse('timing_stats'), {'reset': '1'})
+        # Only the stats request itself, recorded after the reset
+        views = self.client.get(reverse('timing_stats')).json()['views']
+        self.assertEqual([row['url_name'] for row in views], ['timing_stats'])
+
+    def test_stats_are_staff_only(self):
+        response = self.client.get(reverse('timing_stats'))
+        self.assertEqual(response.status_code, 302)
+
+
+# ======================================================
+# 🔎 FULL-TEXT SEARCH INDEX
+# ======================================================
+class FullTextSearchTests(TestCase):
+    """The FTS5 triggers must keep both indexes in step with every write path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Biologiya 2")
+        cls.student = Student.objects.create(full_name="Sardor Olimov")
+        cls.enrollment = Enrollment.objects.create(student=cls.student, classroom=cls.classroom)
+
+    def student_ids(self, text):
+        return set(search.student_queryset(text).values_list('id', flat=True))
+
+    def note_ids(self, text):
+        return set(search.note_queryset(text).values_list('id', flat=True))
+
+    def test_student_index_follows_insert_update_delete(self):
+        self.assertEqual(self.student_ids("sard"), {self.student.id})
+
+        self.student.full_name = "Sherzod Olimov"
+        self.student.save()
+        self.assertEqual(self.student_ids("sardor"), set())
+        self.assertEqual(self.student_ids("sherzod"), {self.student.id})
+
+        Student.objects.filter(id=self.student.id).update(phone="+998901112233")
+        self.assertEqual(self.student_ids("998901112233"), {self.student.id})
+
+        self.student.delete()
+        self.assertEqual(self.student_ids("olimov"), set())
+
+    def test_note_index_follows_insert_update_delete(self):
+        note = Note.objects.create(enrollment=self.enrollment, content="Uy vazifasini bajarmadi.")
+        [bulk] = Note.objects.bulk_create([Note(enrollment=self.enrollment, content="Laboratoriya ishi a'lo.")])
+        self.assertEqual(self.note_ids("vazifa"), {note.id})
+        self.assertEqual(self.note_ids("laboratoriya"), {bulk.id})
+
+        Note.objects.filter(id=note.id).update(content="Darsda faol qatnashdi.")
+        self.assertEqual(self.note_ids("vazifa"), set())
+        self.assertEqual(self.note_ids("faol"), {note.id})
+
+        Note.objects.filter(id=bulk.id).delete()
+        self.assertEqual(self.note_ids("laboratoriya"), set())
+
+    def test_triggers_survive_migrations(self):
+        # post_migrate re-creates triggers dropped by table rebuilds (0008)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        for fts_table in search.FTS_TABLES:
+            for suffix in ('ai', 'ad', 'au'):
+                self.assertIn(f'{fts_table}_{suffix}', triggers)
+
+    def test_admin_search_uses_the_index(self):
+        note = Note.objects.create(enrollment=self.enrollment, content="Nazorat ishiga tayyorlandi.")
+        other = Note.objects.create(
+            enrollment=Enrollment.objects.create(
+                student=Student.objects.create(full_name="Malika Yusupova"), classroom=self.classroom,
+            ),
+            content="Kitob o'qidi.",
+        )
+        request = RequestFactory().get('/admin/')
+
+        student_admin = admin.site._registry[Student]
+        found, duplicates = student_admin.get_search_results(request, Student.objects.all(), "sardor")
+        self.assertEqual(list(found), [self.student])
+        self.assertFalse(duplicates)
+
+        note_admin = admin.site._registry[Note]
+        by_content, _ = note_admin.get_search_results(request, Note.objects.all(), "nazorat")
+        by_student, _ = note_admin.get_search_results(request, Note.objects.all(), "malika")
+        by_class, _ = note_admin.get_search_results(request, Note.objects.all(), "biologiya")
+        self.assertEqual(list(by_content), [note])
+        self.assertEqual(list(by_student), [other])
+        self.assertEqual(set(by_class), {note, other})
+
+        unchanged, _ = student_admin.get_search_results(request, Student.objects.all(), "")
+        self.assertEqual(unchanged.count(), 2)
+
+
+# ======================================================
+# 📄 ADMIN PAGINATION
+# ======================================================
+@mock.patch.object(EstimatedCountPaginator, 'COUNT_CAP', 3)
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [Student.objects.create(full_name=f"Talaba {i}") for i in range(6)]
+        cls.admin = User.objects.create_superuser('admin', password='parol')
+
+    def count(self, queryset):
+        return EstimatedCountPaginator(queryset, 100).count
+
+    def test_small_lists_are_counted_exactly(self):
+        Student.objects.filter(id__in=[s.id for s in self.students[:-1]]).delete()
+        # MAX(pk) alone would still say 6
+        self.assertEqual(self.count(Student.objects.all()), 1)
+
+    def test_large_lists_are_capped_or_estimated(self):
+        # Archived from the oldest end
+        self.students[0].delete()
+        self.assertEqual(self.count(Student.objects.all()), 5)
+        self.assertEqual(self.count(Student.objects.filter(full_name__startswith="Talaba")), 3)
+
+    def test_changelist_never_counts_the_whole_table(self):
+        self.client.force_login(self.admin)
+        for params in ({}, {'q': "talaba"}):
+            with self.subTest(params=params), CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse('admin:tracker_student_changelist'), params)
+            self.assertEqual(response.status_code, 200)
+            counts = [q['sql'] for q in ctx.captured_queries if 'COUNT(' in q['sql']]
+            self.assertTrue(counts)
+            for sql in counts:
+                self.assertIn('LIMIT 3', sql)
+
+
+# ======================================================
+# 📥 BULK STUDENT IMPORT
+# ======================================================
+class ImportStudentsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.physics = Class.objects.create(name="Fizika 1")
+        cls.history = Class.objects.create(name="Tarix 1")
+
+    def csv_file(self, text, encoding='utf-8'):
+        return BytesIO(text.encode(encoding))
+
+    def test_invalid_rows_are_reported_by_line(self):
+        rows = importer.read_rows(self.csv_file(
+            "full_name,email,age,classes\n"
+            "Akmal Norqulov,akmal@maktab.uz,15,Fizika 1\n"
+            "Bekzod Aliyev,not-an-email,16,\n"
+            "Dilshod Karimov,,abc,\n"
+            "Gulnora Rashidova,,14,Kimyo 9\n"
+            ",,15,\n"
+            "Jasur Tursunov,,17,Tarix 1\n"
+        ))
+        result = importer.import_students(rows)
+
+        self.assertEqual(result.rows, 6)
+        self.assertEqual(result.students_created, 2)
+        self.assertEqual(result.enrollments_created, 2)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5, 6])
+        self.assertIn("email", result.errors[0][1])
+        self.assertIn("age", result.errors[1][1])
+        self.assertIn("unknown class Kimyo 9", result.errors[2][1])
+        self.assertIn("full_name", result.errors[3][1])
+        self.assertEqual(
+            sorted(Student.objects.values_list('full_name', flat=True)), ["Akmal Norqulov", "Jasur Tursunov"],
+        )
+
+    def test_class_listed_twice_enrolls_once(self):
+        rows = importer.read_rows(self.csv_file(
+            "full_name,classes\n"
+            "Malika Yusupova,Fizika 1; Fizika 1 ;Tarix 1\n"
+        ))
+        result = importer.import_students(rows)
+
+        self.assertEqual(result.errors, [])
+        self.assertEqual(result.enrollments_created, 2)
+        self.physics.refresh_from_db()
+        self.assertEqual(self.physics.student_count, 1)
+
+    def test_batches_are_flushed_at_the_boundary(self):
+        names = [f"O'quvchi {i}" for i in range(5)]
+        rows = [{'full_name': name, 'classes': "Fizika 1"} for name in names]
+        with CaptureQueriesContext(connection) as queries:
+            result = importer.import_students(rows, batch_size=2)
+
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "tracker_student"')]
+        self.assertEqual(len(inserts), 3)  # 2 + 2 + 1
+        self.assertEqual(result.students_created, 5)
+        self.assertEqual(Enrollment.objects.filter(classroom=self.physics).count(), 5)
+        self.physics.refresh_from_db()
+        self.assertEqual(self.physics.student_count, 5)
+
+    def test_missing_name_column_is_rejected(self):
+        with self.assertRaises(importer.ImportFileError):
+            importer.import_students(importer.read_rows(self.csv_file("email\na@b.uz\n")))
+
+    def test_non_utf8_file_is_a_clean_error(self):
+        data = "full_name\nШахзода Каримова\n".encode('cp1251')
+        with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+            f.write(data)
+            f.flush()
+            with self.assertRaisesMessage(CommandError, "not UTF-8 encoded"):
+                call_command('import_students', f.name, stdout=StringIO())
+
+        upload = SimpleUploadedFile('roster.csv', data, content_type='text/csv')
+        response = self.client.post(reverse('import_students'), {'file': upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("not UTF-8 encoded", response.context['form'].errors['file'][0])
+        self.assertFalse(Student.objects.exists())
+
+    def test_unreadable_line_after_saved_batches_reports_the_partial_import(self):
+        lines = [f"Talaba {i}" for i in range(1500)] + ["Шахзода Каримова"]
+        data = "full_name\n".encode() + "\n".join(lines[:-1]).encode() + "\n".encode() + lines[-1].encode('cp1251')
+
+        upload = SimpleUploadedFile('roster.csv', data, content_type='text/csv')
+        response = self.client.post(reverse('import_students'), {'file': upload})
+        result = response.context['result']
+        saved = Student.objects.count()
+        self.assertContains(response, f"{result.stopped_at}-qatordan boshlab o‘qilmadi")
+        self.assertGreaterEqual(saved, 1000)
+        self.assertEqual(result.students_created, saved)
+        self.assertIn("not UTF-8 encoded", result.file_error)
+        # Every line before stopped_at is saved, none from it on
+        self.assertEqual(result.stopped_at, saved + 2)
+
+        # Importing the rest (fixed) from that line completes the roster once
+        rest = "full_name\n" + "\n".join(lines[result.stopped_at - 2:-1] + ["Shahzoda Karimova"])
+        importer.import_students(importer.read_rows(self.csv_file(rest)))
+        self.assertEqual(Student.objects.count(), 1501)
+        self.assertEqual(Student.objects.values('full_name').distinct().count(), 1501)
+
+        Student.objects.all().delete()
+        with tempfile.NamedTemporaryFile(suffix='.csv') as f:
+            f.write(data)
+            f.flush()
+            out = StringIO()
+            with self.assertRaisesMessage(CommandError, "The rows above it are saved"):
+                call_command('import_students', f.name, stdout=out)
+        self.assertIn(f"{Student.objects.count()} students", out.getvalue())
+
+    def test_broken_xlsx_is_a_clean_error(self):
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            self.skipTest("openpyxl is not installed")
+        with self.assertRaises(importer.ImportFileError):
+            importer.import_students(importer.read_rows(BytesIO(b"not a workbook"), 'roster.xlsx'))
+
+
+# ======================================================
+# 📤 STREAMING EXPORT
+# ======================================================
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        classroom = Class.objects.create(name="Ingliz tili 3")
+        for i in range(5):
+            student = Student.objects.create(full_name=f"O'quvchi {i}")
+            Enrollment.objects.create(student=student, classroom=classroom)
+
+    def url(self, fmt='csv'):
+        return reverse('export_data', args=['rosters', fmt])
+
+    def test_wsgi_export_is_a_sync_stream(self):
+        response = self.client.get(self.url())
+        self.assertFalse(response.is_async)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(',')[:2], ['class_id', 'class'])
+        self.assertEqual(len(lines), 6)
+
+    @mock.patch('tracker.exports.EXPORT_CHUNK_SIZE', 2)
+    async def test_asgi_export_streams_in_chunks(self):
+        response = await self.async_client.get(self.url('json'))
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        # '[' + 5 rows + ']' in blocks of two lines
+        self.assertEqual(len(chunks), 4)
+        rows = json.loads(b''.join(chunks))
+        self.assertEqual(sorted(r['student'] for r in rows), [f"O'quvchi {i}" for i in range(5)])
+
+
+# ======================================================
+# 🧠 FRAGMENT CACHE
+# ======================================================
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+    def test_cached_html_is_not_escaped(self):
+        # A backend that does not pickle SafeString hands back a plain str
+        cache.set(f'tracker:class_grid:{caching.class_list_generation()}', '<div id="grid"></div>')
+        student = Student.objects.create(full_name="Nodira Ergasheva")
+        cache.set_many({
+            f'tracker:student_row:{student.id}:{v}': '<tr id="row"></tr>'
+            for v in caching.student_versions([student.id]).values()
+        })
+
+        self.assertContains(self.client.get(reverse('class_list')), '<div id="grid"></div>')
+        self.assertContains(self.client.get(reverse('all_students')), '<tr id="row"></tr>')
+
+
+# ======================================================
+# 🔢 DENORMALIZED COUNTERS
+# ======================================================
+class CounterTests(TestCase):
+    def setUp(self):
+        self.physics = Class.objects.create(name="Fizika 1")
+        self.history = Class.objects.create(name="Tarix 1")
+        self.student = Student.objects.create(full_name="Akmal Norqulov")
+        self.other = Student.objects.create(full_name="Bekzod Aliyev")
+        for student in (self.student, self.other):
+            for classroom in (self.physics, self.history):
+                enrollment = Enrollment.objects.create(student=student, classroom=classroom)
+                Note.objects.bulk_create([Note(enrollment=enrollment, content="Yaxshi") for _ in range(3)])
+        # bulk_create sends no signals; square the note counters up once
+        reconcile_counters()
+
+    def assertCounts(self, physics, history):
+        self.physics.refresh_from_db()
+        self.history.refresh_from_db()
+        self.assertEqual((self.physics.student_count, self.history.student_count), (physics, history))
+
+    def note_count(self, student, classroom):
+        return Enrollment.objects.get(student=student, classroom=classroom).note_count
+
+    def test_student_delete_cascades_into_class_counts(self):
+        self.assertCounts(2, 2)
+        self.student.delete()
+        self.assertCounts(1, 1)
+        self.assertEqual(reconcile_counters(), {'student_count': 0, 'note_count': 0})
+
+    def test_enrollment_and_note_deletes_adjust_counts(self):
+        Enrollment.objects.filter(student=self.other, classroom=self.history).delete()
+        self.assertCounts(2, 1)
+
+        # The admin's "delete selected" action is a queryset delete
+        Note.objects.filter(enrollment__student=self.student, enrollment__classroom=self.physics)[:1].get().delete()
+        Note.objects.filter(enrollment__student=self.student, enrollment__classroom=self.history).delete()
+        self.assertEqual(self.note_count(self.student, self.physics), 2)
+        self.assertEqual(self.note_count(self.student, self.history), 0)
+
+        # Its enrollments and notes go with it; nothing left to miscount
+        self.history.delete()
+        self.physics.refresh_from_db()
+        self.assertEqual(self.physics.student_count, 2)
+        self.assertEqual(reconcile_counters(), {'student_count': 0, 'note_count': 0})
+
+    def test_plain_creates_are_counted(self):
+        # e.g. the admin add form or the shell
+        Enrollment.objects.create(student=Student.objects.create(full_name="Malika Yusupova"), classroom=self.physics)
+        Note.objects.create(enrollment=Enrollment.objects.get(student=self.student, classroom=self.physics), content="A'lo")
+        self.assertCounts(3, 2)
+        self.assertEqual(self.note_count(self.student, self.physics), 4)
+
+    def test_drifted_counter_does_not_go_negative(self):
+        Enrollment.objects.update(note_count=0)
+        Note.objects.filter(enrollment__student=self.student).delete()
+        self.assertEqual(self.note_count(self.student, self.physics), 0)
+
+    def test_delete_note_view_counts_once(self):
+        note = Note.objects.filter(enrollment__student=self.student, enrollment__classroom=self.physics).first()
+        response = self.client.post(reverse('delete_note', args=[note.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.note_count(self.student, self.physics), 2)
+
+    def test_reconcile_repairs_drift(self):
+        # Raw updates and signal-less deletes bypass the counters
+        Class.objects.update(student_count=0)
+        Enrollment.objects.filter(student=self.student).update(note_count=99)
+        Note.objects.filter(enrollment__student=self.other).order_by()._raw_delete(Note.objects.db)
+
+        self.assertEqual(reconcile_counters(batch_size=1), {'student_count': 2, 'note_count': 4})
+        self.assertCounts(2, 2)
+        self.assertEqual(self.note_count(self.student, self.physics), 3)
+        self.assertEqual(self.note_count(self.other, self.history), 0)
+
+
+# ======================================================
+# 🔍 STUDENT TYPE-AHEAD
+# ======================================================
+class StudentOptionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Tarix 1")
+        cls.enrolled = Student.objects.create(full_name="Akmal Norqulov")
+        cls.akmal = Student.objects.create(full_name="Akmal Rahimov", email="akmal@example.com")
+        Student.objects.create(full_name="Bekzod Aliyev")
+        Enrollment.objects.create(student=cls.enrolled, classroom=cls.classroom)
+
+    def options(self, q, **headers):
+        return self.client.get(reverse('student_options', args=[self.classroom.id]), {'q': q}, headers=headers)
+
+    def test_matches_exclude_enrolled_students(self):
+        results = self.options("akm").json()['results']
+        self.assertEqual(results, [{
+            'id': self.akmal.id, 'full_name': "Akmal Rahimov", 'email': "akmal@example.com", 'phone': None,
+        }])
+
+    def test_short_query_returns_nothing(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.options("a").json(), {'results': []})
+
+    def test_results_are_limited_and_ordered(self):
+        Student.objects.bulk_create(
+            Student(full_name=f"Akmal {chr(ord('Z') - i)}") for i in range(views.STUDENT_OPTIONS_LIMIT + 2)
+        )
+        names = [row['full_name'] for row in self.options("akmal").json()['results']]
+        self.assertEqual(len(names), views.STUDENT_OPTIONS_LIMIT)
+        self.assertEqual(names, sorted(names))
+        self.assertNotIn("Akmal Norqulov", names)
+
+    def test_htmx_gets_partial(self):
+        response = self.options("akm", **{'HX-Request': 'true'})
+        self.assertTemplateUsed(response, 'tracker/partials/student_options.html')
+        self.assertContains(response, "Akmal Rahimov")
+        self.assertNotContains(response, "Akmal Norqulov")
+
+
+# ======================================================
+# 👥 BULK ENROLLMENT
+# ======================================================
+class BulkEnrollTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Ingliz tili 1")
+        cls.akmal = Student.objects.create(full_name="Akmal Norqulov")
+        cls.bekzod = Student.objects.create(full_name="Bekzod Aliyev")
+        cls.twins = [Student.objects.create(full_name="Aziz Karimov") for _ in range(2)]
+        Enrollment.objects.create(student=cls.bekzod, classroom=cls.classroom)
+
+    def post_json(self, payload):
+        return self.client.post(
+            reverse('bulk_enroll_students', args=[self.classroom.id]),
+            json.dumps(payload), content_type='application/json',
+        )
+
+    def test_created_and_skipped_counts(self):
+        response = self.post_json({
+            'student_ids': [self.akmal.id, str(self.bekzod.id), self.akmal.id, 999999, True],
+            'roster': ["Aziz Karimov", "Noma'lum", "²"],
+        })
+        self.assertEqual(response.json(), {
+            'created': 1,
+            'skipped': 1,
+            'unknown': ['True', "Noma'lum", "²", '999999'],
+            'ambiguous': ["Aziz Karimov"],
+        })
+        self.classroom.refresh_from_db()
+        self.assertEqual(self.classroom.student_count, 2)
+
+    def test_form_roster_accepts_ids_and_names(self):
+        response = self.client.post(
+            reverse('bulk_enroll_students', args=[self.classroom.id]),
+            {'student_ids': [str(self.twins[0].id)], 'roster': f"{self.twins[1].id}\n Akmal Norqulov \n\n"},
+        )
+        self.assertEqual(response.context['result'].created, 3)
+        self.assertEqual(self.classroom.enrollments.count(), 4)
+
+    def test_malformed_payloads_are_rejected(self):
+        for payload in (
+            [self.akmal.id],
+            {'student_ids': 5},
+            {'student_ids': {'a': 1}},
+            {'roster': {'a': 1}},
+            {'roster': [["Akmal Norqulov"]]},
+        ):
+            with self.subTest(payload=payload):
+                response = self.post_json(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+        response = self.client.post(
+            reverse('bulk_enroll_students', args=[self.classroom.id]), '{', content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.classroom.enrollments.count(), 1)
+
+    def test_non_decimal_and_out_of_range_ids_are_unknown(self):
+        ids, unknown, ambiguous = resolve_roster(["²", "١٢", str(2 ** 64), f" {self.akmal.id} "])
+        self.assertEqual(ids, [12, self.akmal.id])
+        self.assertEqual(unknown, ["²", str(2 ** 64)])
+        self.assertEqual(ambiguous, [])
+
+
+# ======================================================
+# 📣 NOTE TO THE WHOLE CLASS
+# ======================================================
+class BroadcastNoteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Tarix 2")
+        cls.enrollments = [
+            Enrollment.objects.create(student=Student.objects.create(full_name=name), classroom=cls.classroom)
+            for name in ("Akmal Norqulov", "Bekzod Aliyev", "Dilnoza Saidova")
+        ]
+        Note.objects.create(enrollment=cls.enrollments[0], content="Oldingi eslatma")
+        other = Class.objects.create(name="Tarix 3")
+        cls.outsider = Enrollment.objects.create(student=Student.objects.create(full_name="Jasur"), classroom=other)
+
+    @mock.patch('tracker.enrollments.publish_note_event')
+    def test_one_note_per_enrollment(self, publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = broadcast_note(self.classroom, "Ertaga ekskursiya", batch_size=2)
+
+        self.assertEqual(counts, {e.id: 2 if e == self.enrollments[0] else 1 for e in self.enrollments})
+        for enrollment in self.enrollments:
+            enrollment.refresh_from_db()
+            self.assertEqual(enrollment.notes.filter(content="Ertaga ekskursiya").count(), 1)
+            self.assertEqual(enrollment.note_count, enrollment.notes.count())
+        self.assertFalse(self.outsider.notes.exists())
+        self.assertEqual(sorted(call.args[0] for call in publish.call_args_list), sorted(counts))
+
+    def test_query_count_does_not_grow_with_the_class(self):
+        # ids, INSERT, counter UPDATE, new counts (plus the savepoint pair)
+        with self.assertNumQueries(6):
+            broadcast_note(self.classroom, "Bir xil so'rovlar soni", batch_size=10)
+
+    def test_view_returns_oob_count_badges(self):
+        response = self.client.post(
+            reverse('broadcast_class_note', args=[self.classroom.id]),
+            {'content': "Imtihon dushanba kuni"}, HTTP_HX_REQUEST='true',
+        )
+        self.assertContains(response, "3 ta o'quvchiga eslatma qo'shildi")
+        self.assertContains(response, 'hx-swap-oob="true"', count=3)
+        self.assertContains(
+            response, f'id="enrollment-{self.enrollments[0].id}-note-count" hx-swap-oob="true"',
+        )
+        self.assertContains(response, "2 ta eslatma")
+
+    def test_view_without_content_adds_nothing(self):
+        response = self.client.post(
+            reverse('broadcast_class_note', args=[self.classroom.id]), {'content': "  "}, HTTP_HX_REQUEST='true',
+        )
+        self.assertContains(response, "Eslatma matnini kiriting.")
+        self.assertEqual(Note.objects.count(), 1)
+
+        response = self.client.post(reverse('broadcast_class_note', args=[self.classroom.id]), {'content': "Salom"})
+        self.assertRedirects(response, reverse('class_detail', args=[self.classroom.id]))
+
+
+# ======================================================
+# 📡 LIVE NOTE EVENTS (SSE)
+# ======================================================
+class NoteEventStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.enrollment = Enrollment.objects.create(
+            student=Student.objects.create(full_name="Akmal Norqulov"),
+            classroom=Class.objects.create(name="Kimyo 1"),
+        )
+
+    def subscribers(self):
+        return get_broker().subscriber_count(enrollment_channel(self.enrollment.id))
+
+    @sync_to_async
+    def post_committed(self, url, data=None):
+        # On the main thread, whose connection the view's writes (and on_commit) use
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, data)
+
+    async def next_event(self, stream):
+        return (await asyncio.wait_for(anext(stream), timeout=1)).decode()
+
+    async def test_stream_relays_saved_and_deleted_notes(self):
+        response = await self.async_client.get(reverse('note_events', args=[self.enrollment.id]))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = response.streaming_content
+        self.assertEqual(await self.next_event(stream), 'retry: 3000\n\n')
+        self.assertEqual(self.subscribers(), 1)
+
+        await self.post_committed(reverse('add_note', args=[self.enrollment.id]), {'content': "Uy vazifasi"})
+        note = await Note.objects.aget(enrollment=self.enrollment)
+        event = await self.next_event(stream)
+        self.assertTrue(event.startswith('event: note-saved\ndata: '), event)
+        self.assertIn("Uy vazifasi", event)
+        self.assertIn(f'note-{note.id}', event)
+
+        await self.post_committed(reverse('delete_note', args=[note.id]))
+        self.assertEqual(await self.next_event(stream), f'event: note-deleted\ndata: {note.id}\n\n')
+
+        # A client disconnect cancels the pending read; the subscription must go with it
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(self.subscribers(), 0)
+
+    def test_wsgi_gets_no_content(self):
+        response = self.client.get(reverse('note_events', args=[self.enrollment.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.subscribers(), 0)
+
+
+# ======================================================
+# 🔢 QUERY COUNT REGRESSIONS
+# ======================================================
+class EnrollmentViewQueryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Fizika 1")
+        cls.student = Student.objects.create(full_name="Akmal Norqulov")
+        cls.enrollment = Enrollment.objects.create(student=cls.student, classroom=cls.classroom)
+
+    def detail_url(self):
+        return reverse('student_class_detail', args=[self.classroom.id, self.student.id])
+
+    def test_student_class_detail_query_count_is_fixed(self):
+        for total in (1, 30):
+            Note.objects.bulk_create(
+                Note(enrollment=self.enrollment, content=f"Eslatma {i}")
+                for i in range(total - self.enrollment.notes.count())
+            )
+            with self.subTest(notes=total), self.assertNumQueries(2):
+                response = self.client.get(self.detail_url())
+            self.assertEqual(len(response.context['notes']), min(total, NOTES_PAGE_SIZE))
+
+    def test_student_class_detail_404_for_unenrolled_student(self):
+        other = Student.objects.create(full_name="Boshqa")
+        response = self.client.get(reverse('student_class_detail', args=[self.classroom.id, other.id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_add_note_redirect_without_lazy_loads(self):
+        # enrollment lookup, INSERT, counter UPDATE
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse('add_note', args=[self.enrollment.id]), {'content': "Darsga kechikdi."}
+            )
+        self.assertRedirects(response, self.detail_url())
+
+
+class NoteTimelineTests(TestCase):
+    def test_older_pages_cover_every_note_once(self):
+        classroom = Class.objects.create(name="Kimyo 1")
+        student = Student.objects.create(full_name="Dilnoza Saidova")
+        enrollment = Enrollment.objects.create(student=student, classroom=classroom)
+        # Broadcast notes share one updated_at; id must keep the order total
+        Note.objects.bulk_create(Note(enrollment=enrollment, content=f"n{i}") for i in range(45))
+        url = reverse('load_notes_for_class', args=[enrollment.id])
+
+        seen, cursor = [], None
+        while True:
+            response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            seen += [n.id for n in response.context['notes']]
+            cursor = response.context['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, list(enrollment.notes.order_by('-updated_at', '-id').values_list('id', flat=True)))
+
+
+TAMPERED_CURSORS = (["x", "y"], [None, "abc"], ["2024-01-01T00:00:00", "abc"], ["a", 2 ** 64])
+
+
+class DirectoryPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Ties on full_name straddle the page boundary
+        for name in ("Aziz", "Bobur", "Bobur", "Bobur", "Dilshod"):
+            Student.objects.create(full_name=name)
+
+    @mock.patch('tracker.views.STUDENTS_PAGE_SIZE', 2)
+    def test_pages_have_no_duplicates_or_gaps_on_ties(self):
+        url = reverse('all_students')
+        first = self.client.get(url).context
+        second = self.client.get(url, {'cursor': first['next_cursor']}).context
+        third = self.client.get(url, {'cursor': second['next_cursor']}).context
+        self.assertIsNone(third['next_cursor'])
+
+        # Each rendered row links to its student
+        shown = [
+            int(re.search(r'/student/(\d+)/', row).group(1))
+            for page in (first, second, third) for row in page['student_rows']
+        ]
+        self.assertEqual(shown, list(Student.objects.order_by('full_name', 'id').values_list('id', flat=True)))
+
+    @mock.patch('tracker.views.STUDENTS_PAGE_SIZE', 2)
+    def test_tampered_cursor_gives_the_first_page(self):
+        first = self.client.get(reverse('all_students')).context['student_rows']
+        for values in TAMPERED_CURSORS:
+            with self.subTest(cursor=values):
+                response = self.client.get(reverse('all_students'), {'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['student_rows'], first)
+
+
+class NoteListETagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        classroom = Class.objects.create(name="Biologiya 1")
+        student = Student.objects.create(full_name="Sardor Rahimov")
+        cls.enrollment = Enrollment.objects.create(student=student, classroom=classroom)
+        cls.note = Note.objects.create(enrollment=cls.enrollment, content="Uy vazifasi bajarildi.")
+
+    def setUp(self):
+        # The profile page sets the CSRF cookie, which is part of the ETag,
+        # before any note list is loaded
+        self.fetch()
+
+    def fetch(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('load_notes_for_class', args=[self.enrollment.id]), **headers)
+
+    def test_matching_etag_is_answered_with_one_query(self):
+        etag = self.fetch()['ETag']
+        # Only the validator aggregate runs; no note query, no rendering
+        with self.assertNumQueries(1):
+            response = self.fetch(etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_add_edit_delete_change_the_etag(self):
+        etags = [self.fetch()['ETag']]
+        self.client.post(reverse('add_note', args=[self.enrollment.id]), {'content': "Yangi eslatma"})
+        etags.append(self.fetch(etags[-1])['ETag'])
+        self.client.post(reverse('edit_note', args=[self.note.id]), {'content': "Tahrirlandi"})
+        etags.append(self.fetch(etags[-1])['ETag'])
+        self.client.post(reverse('delete_note', args=[self.note.id]))
+        response = self.fetch(etags[-1])
+        etags.append(response['ETag'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(set(etags)), 4)
+
+    def test_sync_baseline_matches_async_view(self):
+        # loadtest_notes times views.*_sync against the async views
+        request = RequestFactory().get('/')
+        sync_response = views.load_notes_for_class_sync(request, self.enrollment.id)
+        async_response = self.fetch()
+        self.assertEqual(sync_response['ETag'].split('-')[:4], async_response['ETag'].split('-')[:4])
+        self.assertContains(sync_response, "Uy vazifasi bajarildi.")
+
+        post = RequestFactory().post('/', {'content': "Sinxron"}, HTTP_HX_REQUEST='true')
+        added = views.add_note_sync(post, self.enrollment.id)
+        self.assertContains(added, "Sinxron")
+        note = self.enrollment.notes.get(content="Sinxron")
+        views.delete_note_sync(RequestFactory().post('/'), note.id)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.note_count, 1)
+
+
+# ======================================================
+# 🔄 DELTA SYNC
+# ======================================================
+class SyncChangesTests(TestCase):
+    def pull(self, cursor=None, at=None):
+        # Step past the settle window so just-written rows are included
+        at = at or timezone.now() + timedelta(seconds=SYNC_SETTLE_SECONDS + 1)
+        with mock.patch('tracker.sync.timezone.now', return_value=at):
+            response = self.client.get(reverse('sync_changes'), {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pull_returns_only_changes_and_tombstones(self):
+        classroom = Class.objects.create(name="Tarix 1")
+        student = Student.objects.create(full_name="Jasur Tursunov")
+        enrollment = Enrollment.objects.create(student=student, classroom=classroom)
+        note = Note.objects.create(enrollment=enrollment, content="Darsda faol qatnashdi.")
+
+        first = self.pull()
+        self.assertEqual([row['id'] for row in first['notes']], [note.id])
+        self.assertEqual(self.pull(first['cursor'])['students'], [])
+
+        later = timezone.now() + timedelta(minutes=1)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            student.full_name = "Jasur T."
+            student.save()
+            note_id = note.id
+            note.delete()
+
+        delta = self.pull(first['cursor'], at=later + timedelta(minutes=1))
+        self.assertEqual([row['full_name'] for row in delta['students']], ["Jasur T."])
+        self.assertEqual(delta['notes'], [])
+        self.assertEqual(
+            [(row['model'], row['object_id']) for row in delta['deleted']], [('note', note_id)],
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('sync_changes'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tampered_positions_are_rejected(self):
+        valid = self.pull()['cursor']
+        stamp = timezone.now().isoformat()
+        for position in ([stamp, "x"], [None, 1], ["kecha", 1], [stamp, 2 ** 64], [stamp], "x"):
+            with self.subTest(position=position):
+                cursor = encode_cursor([None, None, None, position, None])
+                response = self.client.get(reverse('sync_changes'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(reverse('sync_changes'), {'cursor': valid}).status_code, 200)
+
+
+# ======================================================
+# 📊 CLASS ANALYTICS ROLLUPS
+# ======================================================
+class IncrementalRollupTests(TestCase):
+    """Incremental refreshes must notice deletions, which leave no row behind."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.classroom = Class.objects.create(name="Geografiya 1")
+        cls.untouched = Class.objects.create(name="Geografiya 2")
+        cls.students = [Student.objects.create(full_name=f"O'quvchi {i}") for i in range(3)]
+        cls.enrollments = [
+            Enrollment.objects.create(student=student, classroom=cls.classroom) for student in cls.students
+        ]
+        Enrollment.objects.create(student=cls.students[0], classroom=cls.untouched)
+        cls.notes = [Note.objects.create(enrollment=e, content="Xarita chizdi.") for e in cls.enrollments]
+
+    def setUp(self):
+        refresh_class_stats(full=True)
+        # Start the next incremental run's look-back here, after the fixtures
+        self.since = timezone.now()
+        RollupWatermark.objects.filter(name=WATERMARK_NAME).update(value=self.since + WATERMARK_OVERLAP)
+
+    def assertRefreshed(self, students, notes):
+        self.assertEqual(changed_class_ids(self.since), {self.classroom.id})
+        self.assertEqual(refresh_class_stats(), 1)
+        summary = ClassStatsSummary.objects.get(classroom=self.classroom)
+        self.assertEqual((summary.student_count, summary.note_count), (students, notes))
+
+    def test_no_changes_refresh_nothing(self):
+        self.assertEqual(changed_class_ids(self.since), set())
+        self.assertEqual(refresh_class_stats(), 0)
+
+    def test_cascaded_student_delete(self):
+        self.students[1].delete()
+        self.assertRefreshed(students=2, notes=2)
+
+    def test_enrollment_delete(self):
+        Enrollment.objects.filter(id=self.enrollments[2].id).delete()
+        self.assertRefreshed(students=2, notes=2)
+
+    def test_admin_queryset_note_delete(self):
+        # The admin's "delete selected" action deletes a queryset
+        Note.objects.filter(id=self.notes[0].id).delete()
+        self.assertRefreshed(students=3, notes=2)
+
+    def test_async_note_delete(self):
+        async_to_sync(self.notes[1].adelete)()
+        self.assertRefreshed(students=3, notes=2)
+
+    def test_archived_notes(self):
+        archive_batch([note.id for note in self.notes[:2]], older_than_days=0)
+        self.assertRefreshed(students=3, notes=1)
+
+
+# ======================================================
+# 🗄 NOTE ARCHIVAL
+# ======================================================
+class NoteArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        current = Class.objects.create(name="Adabiyot 1")
+        ended = Class.objects.create(name="Adabiyot 0", ended_at=timezone.now() - timedelta(days=1))
+        student = Student.objects.create(full_name="Nodira Qodirova")
+        cls.enrollment = Enrollment.objects.create(student=student, classroom=current)
+        cls.ended_enrollment = Enrollment.objects.create(student=student, classroom=ended)
+        cls.old = [Note.objects.create(enrollment=cls.enrollment, content=f"Eski eslatma {i}") for i in range(3)]
+        cls.recent = Note.objects.create(enrollment=cls.enrollment, content="Yangi eslatma")
+        cls.of_ended = Note.objects.create(enrollment=cls.ended_enrollment, content="Tugagan sinf")
+        Note.objects.filter(id__in=[n.id for n in cls.old]).update(updated_at=timezone.now() - timedelta(days=400))
+
+    def archive(self, **kwargs):
+        return archive_notes(pause=0, **kwargs)
+
+    def test_selects_old_notes_and_notes_of_ended_classes(self):
+        self.assertEqual(set(archivable_notes()), {*self.old, self.of_ended})
+        self.assertEqual(set(archivable_notes(ended_classes=False)), set(self.old))
+
+    @mock.patch('tracker.archive.publish_note_event')
+    def test_moved_notes_leave_tombstones_counts_and_events(self, publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.archive(batch_size=2), 4)
+
+        moved = [*self.old, self.of_ended]
+        self.assertFalse(Note.objects.filter(id__in=[n.id for n in moved]).exists())
+        self.assertEqual(
+            set(Tombstone.objects.filter(model='note').values_list('object_id', flat=True)), {n.id for n in moved},
+        )
+        for enrollment in (self.enrollment, self.ended_enrollment):
+            enrollment.refresh_from_db()
+            self.assertEqual(enrollment.note_count, enrollment.notes.count())
+        self.assertEqual(
+            sorted((call.args[0], call.args[1]['id']) for call in publish.call_args_list),
+            sorted((n.enrollment_id, n.id) for n in moved),
+        )
+        for call in publish.call_args_list:
+            self.assertEqual(call.args[1]['event'], 'note-deleted')
+
+    def test_archived_notes_round_trip(self):
+        originals = list(
+            self.enrollment.notes.filter(id__in=[n.id for n in self.old])
+            .order_by('-updated_at', '-id').values_list('id', 'content', 'created_at', 'updated_at')
+        )
+        self.archive()
+
+        response = self.client.get(reverse('load_archived_notes', args=[self.enrollment.id]))
+        archived = [(n.note_id, n.content, n.created_at, n.updated_at) for n in response.context['notes']]
+        self.assertEqual(archived, originals)
+        self.assertContains(response, "Eski eslatma 0")
+        live = self.client.get(reverse('load_notes_for_class', args=[self.enrollment.id])).context['notes']
+        self.assertEqual(list(live), [self.recent])
+
+    def test_tampered_cursor_shows_the_newest_page(self):
+        self.archive()
+        url = reverse('load_archived_notes', args=[self.enrollment.id])
+        first = list(self.client.get(url).context['notes'])
+        for values in TAMPERED_CURSORS:
+            with self.subTest(cursor=values):
+                response = self.client.get(url, {'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(list(response.context['notes']), first)
+
+    def test_interrupted_run_resumes(self):
+        self.assertEqual(self.archive(limit=1), 1)
+        self.assertEqual(self.archive(batch_size=1), 3)
+        self.assertEqual(self.archive(), 0)
+        self.assertEqual(ArchivedNote.objects.count(), 4)
+
+    def test_note_edited_after_selection_is_kept(self):
+        edited = self.old[0]
+        edited.content = "Tahrirlandi"
+        edited.save()
+        self.assertEqual(archive_batch([n.id for n in self.old]), 2)
+        self.assertTrue(Note.objects.filter(id=edited.id).exists())
+
+
+# ======================================================
+# 🗂 INDEX USAGE (EXPLAIN QUERY PLAN)
+# ======================================================
+class QueryPlanTests(TestCase):
+    """The hot list queries must be served by an index, without a sort step."""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_enrollment_notes_newest_first(self):
+        notes = Note.objects.filter(enrollment_id=1)
+        self.assertUsesIndex(notes, 'note_enrollment_recent_idx')
+        self.assertUsesIndex(notes.order_by('-updated_at', '-id'), 'note_enrollment_recent_idx')
+
+    def test_class_roster_by_join_date(self):
+        roster = Enrollment.objects.filter(classroom_id=1).order_by('joined_at')
+        self.assertUsesIndex(roster, 'enrollment_class_joined_idx')
+
+    def test_student_directory_keyset_page(self):
+        page = Student.objects.filter(full_name__gt="M").order_by('full_name', 'id')[:50]
+        self.assertUsesIndex(page, 'student_name_id_idx')
+
+
+# ======================================================
+# 💾 ONLINE BACKUP
+# ======================================================
+class BackupTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.source = self.dir / 'live.sqlite3'
+        with sqlite3.connect(self.source) as conn:
+            conn.execute("CREATE TABLE note (id INTEGER PRIMARY KEY, content TEXT)")
+            conn.executemany("INSERT INTO note (content) VALUES (?)", [("x" * 200,)] * 2000)
+        conn.close()
+
+    def count_rows(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM note").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_compressed_backups_are_rotated(self):
+        names = [f'live-2026010{i}-000000.sqlite3' for i in range(1, 4)]
+        with mock.patch('tracker.backup.backup_name', side_effect=names):
+            for _ in names:
+                path, _ = backup_database(self.source, self.dir / 'backups', pages=10, pause=0, compress=True, keep=2)
+
+        self.assertEqual(sorted(p.name for p in (self.dir / 'backups').iterdir()), [n + '.gz' for n in names[1:]])
+        restored = self.dir / 'restored.sqlite3'
+        restored.write_bytes(gzip.decompress(path.read_bytes()))
+        self.assertEqual(self.count_rows(restored), 2000)
+
+    def test_keep_below_one_is_rejected(self):
+        dest = self.dir / 'backups'
+        path, _ = backup_database(self.source, dest, pages=100, pause=0)
+        for keep in (0, -1):
+            with self.subTest(keep=keep):
+                with self.assertRaises(CommandError):
+                    call_command('backup_db', dest_dir=dest, keep=keep, stdout=StringIO())
+                with self.assertRaises(ValueError):
+                    rotate_backups(dest, self.source, keep)
+        self.assertEqual(list(dest.iterdir()), [path])
+
+    def test_concurrent_writes_fall_back_to_single_step(self):
+        writer = sqlite3.connect(self.source)
+        self.addCleanup(writer.close)
+
+        def write(done, total):
+            writer.execute("INSERT INTO note (content) VALUES ('new')")
+            writer.commit()
+
+        path, restarts = backup_database(
+            self.source, self.dir / 'backups', pages=10, pause=0, max_restarts=2, progress=write,
+        )
+        self.assertEqual(restarts, 3)
+        self.assertEqual(self.count_rows(path), self.count_rows(self.source))
+
+
+# ======================================================
+# 📖 READ-ONLY ROUTING
+# ======================================================
+@mock.patch('tracker.routers.replica_configured', return_value=True)
+class ReadReplicaRoutingTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.view = read_only(lambda request: Student.objects.all().db)
+
+    def test_read_only_views_use_the_replica(self, _):
+        self.assertEqual(self.view(self.factory.get('/')), REPLICA_ALIAS)
+        self.assertEqual(Student.objects.all().db, 'default')
+
+    def test_writes_and_pinned_browsers_use_the_primary(self, _):
+        self.assertEqual(self.view(self.factory.post('/')), 'default')
+        pinned = self.factory.get('/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(self.view(pinned), 'default')
+
+        student = Student(full_name="Aziza Karimova")
+        student._state.db = REPLICA_ALIAS
+        self.assertEqual(router.db_for_write(Student, instance=student), 'default')
+
+    def test_fragment_caches_are_filled_from_the_primary(self, _):
+        self.addCleanup(cache.clear)
+        Class.objects.create(name="Musiqa 1")
+        student = Student.objects.create(full_name="Yangi Ism")
+        # The directory page listed the student from a replica that lags behind
+        listed = Student(id=student.id, full_name="Eski Ism")
+        render = read_only(lambda request: (caching.class_grid_html(), caching.student_rows_html([listed])))
+
+        # 'replica' is not among this test's databases (nor configured at all
+        # in the development profile): a query sent there fails the test
+        grid, [row] = render(self.factory.get('/'))
+        self.assertIn("Musiqa 1", grid)
+        self.assertIn("Yangi Ism", row)
+
+    @mock.patch('tracker.middleware.replica_configured', return_value=True)
+    def test_post_pins_the_browser(self, *_):
+        response = self.client.post(reverse('create_class'), {})
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertNotIn(PIN_COOKIE, self.client.get(reverse('class_list')).cookies)
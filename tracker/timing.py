@@ -0,0 +1,125 @@
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.template.backends.django import DjangoTemplates, Template
+
+
+# ======================================================
+# ⏱ PER-REQUEST TIMING
+# ======================================================
+# RequestTimings collects SQL and template time for the request being served.
+# The middleware installs it in a context variable; the DB execute wrapper and
+# the template backend below add to it. Finished requests are folded into
+# process-wide aggregates keyed by URL name.
+
+_current = ContextVar('tracker_request_timings', default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += perf_counter() - start
+
+
+def start_request():
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+# ------------------------------------------------------
+# Template backend that reports render time
+# ------------------------------------------------------
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        start, db_before = perf_counter(), timings.db_time
+        try:
+            return super().render(context, request)
+        finally:
+            # Lazy queries run while rendering are already counted as DB time
+            elapsed = perf_counter() - start - (timings.db_time - db_before)
+            timings.template_time += max(elapsed, 0.0)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend whose templates add their render time to the request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+# ------------------------------------------------------
+# Process-wide aggregates per URL name
+# ------------------------------------------------------
+_lock = threading.Lock()
+_stats = {}
+
+
+def record(name, total, timings):
+    with _lock:
+        entry = _stats.setdefault(name, {
+            'requests': 0, 'queries': 0, 'max_queries': 0,
+            'total_ms': 0.0, 'db_ms': 0.0, 'template_ms': 0.0, 'python_ms': 0.0, 'max_ms': 0.0,
+        })
+        entry['requests'] += 1
+        entry['queries'] += timings.queries
+        entry['max_queries'] = max(entry['max_queries'], timings.queries)
+        entry['total_ms'] += total * 1000
+        entry['db_ms'] += timings.db_time * 1000
+        entry['template_ms'] += timings.template_time * 1000
+        entry['python_ms'] += python_time(total, timings) * 1000
+        entry['max_ms'] = max(entry['max_ms'], total * 1000)
+
+
+def python_time(total, timings):
+    return max(total - timings.db_time - timings.template_time, 0.0)
+
+
+def snapshot():
+    """Per-URL averages, slowest average first."""
+    with _lock:
+        items = [(name, dict(entry)) for name, entry in _stats.items()]
+
+    rows = []
+    for name, e in items:
+        n = e['requests']
+        rows.append({
+            'url_name': name,
+            'requests': n,
+            'avg_queries': round(e['queries'] / n, 2),
+            'max_queries': e['max_queries'],
+            'avg_ms': round(e['total_ms'] / n, 2),
+            'avg_db_ms': round(e['db_ms'] / n, 2),
+            'avg_template_ms': round(e['template_ms'] / n, 2),
+            'avg_python_ms': round(e['python_ms'] / n, 2),
+            'max_ms': round(e['max_ms'], 2),
+        })
+    return sorted(rows, key=lambda r: r['avg_ms'], reverse=True)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
@@ -14,6 +15,11 @@ urlpatterns = [
     # ------------------------------------------------------
     path('class/<int:class_id>/add-student/', views.add_student, name='add_student'),
     path('class/<int:class_id>/enroll-student/', views.enroll_student, name='enroll_student'),
+    path('class/<int:class_id>/student-options/', views.student_options, name='student_options'),
+    path('class/<int:class_id>/bulk-enroll/', views.bulk_enroll_students, name='bulk_enroll_students'),
+    path('class/<int:class_id>/broadcast-note/', views.broadcast_class_note, name='broadcast_class_note'),
+    path('class/<int:class_id>/stats/', views.class_stats, name='class_stats'),
+    path('class/<int:class_id>/stats.json', views.class_stats_json, name='class_stats_json'),
     path('students/<int:pk>/edit/', views.edit_student, name='edit_student'),
 
 
@@ -32,6 +38,8 @@ urlpatterns = [
     path("enrollments/<int:enrollment_id>/add-note/", views.add_note, name="add_note"),
     path("edit-note/<int:note_id>/", views.edit_note, name="edit_note"),
     path("delete-note/<int:note_id>/", views.delete_note, name="delete_note"),
+    path("enrollments/<int:enrollment_id>/note-events/", views.note_events, name="note_events"),
+    path("enrollments/<int:enrollment_id>/archived-notes/", views.load_archived_notes, name="load_archived_notes"),
 
     # ======================================================
     # 🌍 GLOBAL STUDENT DIRECTORY
@@ -49,5 +57,41 @@ urlpatterns = [
     ),
 
     path("students/add/", views.add_student_global, name="add_student_global"),
+    path("students/import/", views.import_students, name="import_students"),
 
-]
\ No newline at end of file
+    # ======================================================
+    # 📤 EXPORTS (streamed CSV / JSON)
+    # ======================================================
+    path('export/<slug:dataset>.<slug:fmt>', views.export_data, name='export_data'),
+
+    # ======================================================
+    # 🔎 SEARCH
+    # ======================================================
+    path('search/', views.search, name='search'),
+
+    # ======================================================
+    # 🔄 DELTA SYNC
+    # ======================================================
+    path('sync/', views.sync_changes, name='sync_changes'),
+
+    # ======================================================
+    # ⏱ REQUEST TIMING STATS
+    # ======================================================
+    path('stats/timing/', views.timing_stats, name='timing_stats'),
+
+]
+
+# ------------------------------------------------------
+# 🐢 SYNC NOTE ENDPOINTS (loadtest_notes baseline only)
+# ------------------------------------------------------
+# The async endpoints' paths under /loadtest/sync (loadtest_notes relies on that)
+if settings.TRACKER_LOADTEST_SYNC_VIEWS:
+    urlpatterns += [
+        path("loadtest/sync/enrollments/<int:enrollment_id>/add-note/", views.add_note_sync, name="add_note_sync"),
+        path("loadtest/sync/delete-note/<int:note_id>/", views.delete_note_sync, name="delete_note_sync"),
+        path(
+            'loadtest/sync/student/load-notes/<int:enrollment_id>/',
+            views.load_notes_for_class_sync,
+            name='load_notes_for_class_sync',
+        ),
+    ]
@@ -1,23 +1,43 @@
-from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse, HttpResponse
+import hashlib
+import json
+
+from django.shortcuts import aget_object_or_404, render, get_object_or_404, redirect
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse
 from django.views.decorators.http import require_POST
-from django.db.models import Prefetch
+from django.db.models import Count, Max, Prefetch
 from django.contrib import messages
-from django.views.decorators.http import require_http_methods, require_POST
-
-from .models import Class, Student, Enrollment, Note
+from django.contrib.admin.views.decorators import staff_member_required
+from django.views.decorators.http import condition, require_GET, require_http_methods, require_POST
+from django.views.decorators.cache import cache_control
+from django.views.decorators.gzip import gzip_page
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.template.loader import render_to_string
+from django.utils.dateparse import parse_datetime
+
+from .models import ArchivedNote, Class, ClassWeeklyStats, Student, Enrollment, Note
 from django.urls import reverse
 
-from .forms import ClassForm, EnrollStudentForm, StudentCreateForm
+from .forms import ClassForm, EnrollStudentForm, StudentCreateForm, StudentImportForm
+from . import importer, timing
+from .caching import class_grid_html, student_rows_html
+from .enrollments import broadcast_note, bulk_enroll, parse_student_id, resolve_roster
+from .exports import DATASETS as EXPORT_DATASETS, EXPORT_FORMATS, astream_export, stream_export
+from .pagination import apaginate_keyset, paginate_keyset
+from .pubsub import enrollment_channel, get_broker
+from .routers import read_only
+from .search import search_notes, search_students, student_queryset
+from .sync import SYNC_MAX_PAGE_SIZE, SYNC_PAGE_SIZE, InvalidCursor, changes_since
 
 
 # ==================================================
 # 1️⃣ HOME PAGE — LIST ALL CLASSES
 # ==================================================
+@read_only
 def class_list(request):
-    """Display all classes."""
-    classes = Class.objects.all().order_by('name')
-    return render(request, 'tracker/class_list.html', {'classes': classes})
+    """Display all classes (the grid is cached until a class changes)."""
+    return render(request, 'tracker/class_list.html', {'class_grid': class_grid_html()})
 
 
 # ==================================================
@@ -64,9 +84,8 @@ def enroll_student(request, class_id):
         form = EnrollStudentForm(request.POST)
         if form.is_valid():
             student = form.cleaned_data['student']
-            enrollment, created = Enrollment.objects.get_or_create(
-                student=student, classroom=classroom
-            )
+            # A new enrollment is counted by the post_save signal
+            Enrollment.objects.get_or_create(student=student, classroom=classroom)
             return redirect('class_detail', class_id=classroom.id)
     else:
         form = EnrollStudentForm()
@@ -77,6 +96,157 @@ def enroll_student(request, class_id):
     })
 
 
+# ==================================================
+# 🔍 TYPE-AHEAD STUDENT PICKER (for enroll_student)
+# ==================================================
+STUDENT_OPTIONS_LIMIT = 10
+STUDENT_OPTIONS_MIN_CHARS = 2
+
+
+def student_options(request, class_id):
+    """Top matches for ``q`` among students not yet enrolled in the class."""
+    query = request.GET.get('q', '').strip()
+    students = []
+    if len(query) >= STUDENT_OPTIONS_MIN_CHARS:
+        students = list(
+            student_queryset(query)
+            .exclude(enrollments__classroom_id=class_id)
+            .order_by('full_name', 'id')[:STUDENT_OPTIONS_LIMIT]
+        )
+
+    if request.headers.get("HX-Request"):
+        return render(request, 'tracker/partials/student_options.html', {
+            'students': students,
+            'query': query,
+        })
+    return JsonResponse({'results': [
+        {'id': s.id, 'full_name': s.full_name, 'email': s.email, 'phone': s.phone}
+        for s in students
+    ]})
+
+
+# ==================================================
+# 👥 BULK ENROLLMENT (ids and/or pasted roster)
+# ==================================================
+def _bulk_enroll_payload(request):
+    """
+    Return (student ids, roster lines, invalid ids) from a form or JSON POST.
+
+    Raises ValueError for a payload of the wrong shape.
+    """
+    if request.content_type == 'application/json':
+        payload = json.loads(request.body or '{}')
+        if not isinstance(payload, dict):
+            raise ValueError("Expected a JSON object")
+        raw_ids = payload.get('student_ids') or []
+        roster = payload.get('roster') or ''
+        if not isinstance(raw_ids, list):
+            raise ValueError("student_ids must be a list of student ids")
+        if isinstance(roster, list) and all(isinstance(line, (str, int)) for line in roster):
+            roster = '\n'.join(map(str, roster))
+        if not isinstance(roster, str):
+            raise ValueError("roster must be a string or a list of lines")
+    else:
+        raw_ids = request.POST.getlist('student_ids')
+        roster = request.POST.get('roster', '')
+
+    ids, invalid = [], []
+    for value in raw_ids:
+        student_id = parse_student_id(value)
+        if student_id is None:
+            invalid.append(str(value))
+        else:
+            ids.append(student_id)
+    return ids, roster.splitlines(), invalid
+
+
+def bulk_enroll_students(request, class_id):
+    """
+    Enroll many students into a class in one request.
+
+    Accepts ``student_ids`` (picked with the type-ahead search) and/or a
+    ``roster`` paste of ids or exact full names, as a form POST or as JSON.
+    JSON requests get the created/skipped counts back as JSON.
+    """
+    classroom = get_object_or_404(Class, id=class_id)
+    result = None
+
+    if request.method == 'POST':
+        wants_json = request.content_type == 'application/json'
+        try:
+            ids, roster_lines, invalid = _bulk_enroll_payload(request)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+
+        roster_ids, unknown, ambiguous = resolve_roster(roster_lines)
+        result = bulk_enroll(classroom, ids + roster_ids, invalid + unknown, ambiguous)
+        if wants_json:
+            return JsonResponse(result.as_dict())
+
+    return render(request, 'tracker/bulk_enroll.html', {
+        'classroom': classroom,
+        'result': result,
+    })
+
+
+# ==================================================
+# 📣 NOTE TO THE WHOLE CLASS
+# ==================================================
+@require_POST
+def broadcast_class_note(request, class_id):
+    """Add one note to every student of the class; HTMX gets per-row count updates."""
+    classroom = get_object_or_404(Class, id=class_id)
+    content = request.POST.get("content", "").strip()
+    counts = broadcast_note(classroom, content) if content else {}
+
+    if request.headers.get("HX-Request"):
+        return render(request, "tracker/partials/broadcast_result.html", {
+            "content": content,
+            "counts": counts,
+        })
+    return redirect("class_detail", class_id=classroom.id)
+
+
+# ==================================================
+# 📊 CLASS STATS (precomputed rollups only)
+# ==================================================
+def _class_stats(class_id):
+    """Summary (or None before the first refresh) and weekly rows of a class."""
+    classroom = get_object_or_404(Class.objects.select_related('stats_summary'), id=class_id)
+    summary = getattr(classroom, 'stats_summary', None)
+    weeks = list(ClassWeeklyStats.objects.filter(classroom_id=class_id).order_by('week'))
+    return classroom, summary, weeks
+
+
+def class_stats(request, class_id):
+    """Class dashboard: enrollments and notes per week, most/fewest notes."""
+    classroom, summary, weeks = _class_stats(class_id)
+    peak = max((max(w.students_joined, w.notes_written) for w in weeks), default=0) or 1
+    return render(request, 'tracker/class_stats.html', {
+        'classroom': classroom,
+        'summary': summary,
+        'weeks': [
+            (w, w.students_joined * 100 // peak, w.notes_written * 100 // peak) for w in weeks
+        ],
+    })
+
+
+def class_stats_json(request, class_id):
+    classroom, summary, weeks = _class_stats(class_id)
+    return JsonResponse({
+        'class_id': classroom.id,
+        'refreshed_at': summary.refreshed_at if summary else None,
+        'student_count': summary.student_count if summary else None,
+        'note_count': summary.note_count if summary else None,
+        'most_notes': summary.most_notes if summary else [],
+        'fewest_notes': summary.fewest_notes if summary else [],
+        'weeks': [
+            {'week': w.week, 'students_joined': w.students_joined, 'notes_written': w.notes_written}
+            for w in weeks
+        ],
+    })
+
+
 # ==================================================
 # 5️⃣ ADD NEW STUDENT & ENROLL TO CLASS
 # ==================================================
@@ -102,18 +272,37 @@ def add_student(request, class_id):
 # ==================================================
 # 6️⃣ STUDENT DETAIL (Within Specific Class)
 # ==================================================
+NOTES_PAGE_SIZE = 20
+NOTE_ORDERING = ('-updated_at', '-id')
+
+
+def _note_page(enrollment_id, cursor=None):
+    """One page of an enrollment's notes, newest first, plus the older-page cursor."""
+    return paginate_keyset(
+        Note.objects.filter(enrollment_id=enrollment_id),
+        NOTE_ORDERING,
+        cursor=cursor,
+        page_size=NOTES_PAGE_SIZE,
+    )
+
+
 def student_class_detail(request, class_id, student_id):
     """Show a student's notes & details for a specific class."""
-    classroom = get_object_or_404(Class, id=class_id)
-    student = get_object_or_404(Student, id=student_id)
-    enrollment = get_object_or_404(Enrollment, classroom=classroom, student=student)
-    notes = enrollment.notes.all().order_by('-updated_at')
+    # Class and student come along with the enrollment (one JOINed query);
+    # only the newest page of notes is loaded, older ones on demand.
+    enrollment = get_object_or_404(
+        Enrollment.objects.select_related('student', 'classroom'),
+        classroom_id=class_id,
+        student_id=student_id,
+    )
+    notes, next_cursor = _note_page(enrollment.id)
 
     return render(request, 'tracker/student_class_detail.html', {
-        'classroom': classroom,
-        'student': student,
+        'classroom': enrollment.classroom,
+        'student': enrollment.student,
         'enrollment': enrollment,
-        'notes': notes
+        'notes': notes,
+        'next_cursor': next_cursor,
     })
 
 
@@ -125,30 +314,33 @@ from django.http import HttpResponse
 from django.views.decorators.http import require_POST
 from .models import Enrollment, Note
 
+# The note endpoints are async: under ASGI a slow SQLite write awaits on the
+# event loop instead of holding a worker thread per request.
+
 # =============================
 # ADD NOTE
 # =============================
 @require_POST
-def add_note(request, enrollment_id):
-    enrollment = get_object_or_404(Enrollment, id=enrollment_id)
+async def add_note(request, enrollment_id):
+    enrollment = await aget_object_or_404(Enrollment, id=enrollment_id)
     content = request.POST.get("content")
 
     if content:
-        note = Note.objects.create(enrollment=enrollment, content=content)
+        note = await Note.objects.acreate(enrollment=enrollment, content=content)
         if request.headers.get("HX-Request"):
             return render(request, "tracker/note_block.html", {"note": note})
-    return redirect("student_class_detail", classroom_id=enrollment.classroom.id, student_id=enrollment.student.id)
+    return redirect("student_class_detail", class_id=enrollment.classroom_id, student_id=enrollment.student_id)
 
 
 # =============================
 # EDIT NOTE
 # =============================
-def edit_note(request, note_id):
-    note = get_object_or_404(Note, id=note_id)
+async def edit_note(request, note_id):
+    note = await aget_object_or_404(Note, id=note_id)
 
     if request.method == "POST":
         note.content = request.POST.get("content")
-        note.save()
+        await note.asave()
         if request.headers.get("HX-Request"):
             return render(request, "tracker/note_block.html", {"note": note})
         return redirect(request.META.get('HTTP_REFERER', '/'))
@@ -161,30 +353,118 @@ def edit_note(request, note_id):
 # DELETE NOTE
 # =============================
 @require_POST
-def delete_note(request, note_id):
-    note = get_object_or_404(Note, id=note_id)
-    note.delete()
+async def delete_note(request, note_id):
+    note = await aget_object_or_404(Note, id=note_id)
+    await note.adelete()
     return HttpResponse("")  # HTMX will remove element automatically
 
 
+# =============================
+# ARCHIVED NOTES (read-only, on demand)
+# =============================
+def load_archived_notes(request, enrollment_id):
+    """HTMX "load archive": archived notes of an enrollment, newest first, paginated."""
+    enrollment = get_object_or_404(Enrollment, id=enrollment_id)
+    cursor = request.GET.get('cursor')
+    notes, next_cursor = paginate_keyset(
+        ArchivedNote.objects.filter(enrollment=enrollment),
+        NOTE_ORDERING,
+        cursor=cursor,
+        page_size=NOTES_PAGE_SIZE,
+    )
+    return render(request, 'tracker/partials/archived_note_list.html', {
+        'notes': notes,
+        'next_cursor': next_cursor,
+        'enrollment_id': enrollment.id,
+        'older_page': bool(cursor),
+    })
+
+
+# =============================
+# LIVE NOTE STREAM (SSE)
+# =============================
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _sse(event, data):
+    lines = ''.join(f'data: {line}\n' for line in str(data).splitlines() or [''])
+    return f'event: {event}\n{lines}\n'
+
+
+async def _note_event_stream(request, enrollment_id):
+    subscription = get_broker().subscribe(enrollment_channel(enrollment_id))
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            message = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+            if message is None:
+                yield ': keepalive\n\n'
+            elif message['event'] == 'note-deleted':
+                yield _sse('note-deleted', message['id'])
+            else:
+                # Rendered per subscriber, so the fragment carries their CSRF token
+                note = Note(
+                    id=message['id'],
+                    enrollment_id=enrollment_id,
+                    content=message['content'],
+                    updated_at=parse_datetime(message['updated_at']),
+                )
+                html = render_to_string("tracker/note_block.html", {"note": note}, request=request)
+                yield _sse(message['event'], html)
+    finally:
+        subscription.close()
+
+
+async def note_events(request, enrollment_id):
+    """
+    Server-sent events for one enrollment: rendered note blocks as notes are
+    added or edited, note ids as they are deleted.
+
+    Needs the ASGI server. Under WSGI the stream would tie up a worker
+    thread forever, so the client gets 204 No Content, which tells
+    EventSource not to reconnect.
+    """
+    if not await Enrollment.objects.filter(id=enrollment_id).aexists():
+        raise Http404("Enrollment not found")
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    response = StreamingHttpResponse(
+        _note_event_stream(request, enrollment_id), content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # keep reverse proxies from buffering events
+    return response
+
+
 # ==================================================
 # 8️⃣ GLOBAL STUDENT DIRECTORY
 # ==================================================
+STUDENTS_PAGE_SIZE = 50
+
+
+@read_only
 def all_students(request):
-    """Display all students and their enrolled classes."""
-    students = (
-        Student.objects.prefetch_related(
-            Prefetch('enrollments', queryset=Enrollment.objects.select_related('classroom'))
-        )
-        .all()
-        .order_by('full_name')
+    """Display all students and their enrolled classes, one keyset page at a time."""
+    students, next_cursor = paginate_keyset(
+        Student.objects.all(),
+        ordering=('full_name', 'id'),
+        cursor=request.GET.get('cursor'),
+        page_size=STUDENTS_PAGE_SIZE,
     )
-    return render(request, 'tracker/all_students.html', {'students': students})
+    # Rows come from the fragment cache; enrollments are only loaded for misses
+    context = {'student_rows': student_rows_html(students), 'next_cursor': next_cursor}
+
+    # HTMX "load more" / list refresh only needs the rows, not the whole page
+    if request.headers.get("HX-Request"):
+        return render(request, 'tracker/partials/student_rows.html', context)
+    return render(request, 'tracker/all_students.html', context)
 
 
 # ==================================================
 # 9️⃣ GLOBAL STUDENT PROFILE (With All Classes)
 # ==================================================
+@read_only
 def global_student_detail(request, student_id):
     """View a student's global profile with all enrolled classes."""
     student = get_object_or_404(
@@ -199,11 +479,110 @@ def global_student_detail(request, student_id):
 # ==================================================
 # 🔟 LOAD NOTES FOR SPECIFIC CLASS (IN GLOBAL PROFILE)
 # ==================================================
-def load_notes_for_class(request, enrollment_id):
-    """AJAX loader for showing notes when a class is selected in global student profile."""
+async def _load_notes_validators(request, enrollment_id):
+    """max(updated_at) and count of the enrollment's notes, loaded once per request."""
+    request._notes_validators = await Note.objects.filter(enrollment_id=enrollment_id).aaggregate(
+        latest=Max('updated_at'), count=Count('id'),
+    )
+    return request._notes_validators
+
+
+def _notes_etag(request, enrollment_id):
+    validators = request._notes_validators
+    latest = validators['latest'].timestamp() if validators['latest'] else 0
+    # The fragment embeds CSRF tokens, so it is only reusable for the same secret
+    csrf = hashlib.sha1(request.COOKIES.get(settings.CSRF_COOKIE_NAME, '').encode()).hexdigest()[:8]
+    return f'"notes-{enrollment_id}-{validators["count"]}-{latest}-{csrf}"'
+
+
+def _notes_last_modified(request, enrollment_id):
+    return request._notes_validators['latest']
+
+
+@read_only
+@cache_control(private=True, no_cache=True)
+async def load_notes_for_class(request, enrollment_id):
+    """
+    AJAX loader for showing notes when a class is selected in global student profile.
+
+    Returns the newest NOTES_PAGE_SIZE notes; ``?cursor=`` (from the "show
+    older notes" button) returns the page after it.
+
+    Answers 304 Not Modified when the notes have not changed since the copy
+    the browser already has, skipping the note query and the rendering.
+    """
+    # condition() calls the validator functions synchronously, so the
+    # aggregate they read is awaited here first.
+    await _load_notes_validators(request, enrollment_id)
+    return await _note_list(request, enrollment_id)
+
+
+@condition(etag_func=_notes_etag, last_modified_func=_notes_last_modified)
+async def _note_list(request, enrollment_id):
+    # The validators already tell whether there are notes; only look the
+    # enrollment up when there are none, to tell "no notes" from a 404.
+    if not request._notes_validators['count']:
+        await aget_object_or_404(Enrollment, id=enrollment_id)
+    cursor = request.GET.get('cursor')
+    notes, next_cursor = await apaginate_keyset(
+        Note.objects.filter(enrollment_id=enrollment_id),
+        NOTE_ORDERING,
+        cursor=cursor,
+        page_size=NOTES_PAGE_SIZE,
+    )
+    return render(request, 'tracker/partials/note_list.html', {
+        'notes': notes,
+        'next_cursor': next_cursor,
+        'enrollment_id': enrollment_id,
+        'older_page': bool(cursor),
+    })
+
+
+# ==================================================
+# 🐢 SYNC NOTE ENDPOINTS (load-test baseline)
+# ==================================================
+# The sync ORM versions of add_note, delete_note and load_notes_for_class,
+# kept so loadtest_notes can time both implementations on the same server.
+# Only routed when settings.TRACKER_LOADTEST_SYNC_VIEWS is on.
+@require_POST
+def add_note_sync(request, enrollment_id):
     enrollment = get_object_or_404(Enrollment, id=enrollment_id)
-    notes = enrollment.notes.all().order_by('-updated_at')
-    return render(request, 'tracker/partials/note_list.html', {'notes': notes})
+    content = request.POST.get("content")
+
+    if content:
+        note = Note.objects.create(enrollment=enrollment, content=content)
+        if request.headers.get("HX-Request"):
+            return render(request, "tracker/note_block.html", {"note": note})
+    return redirect("student_class_detail", class_id=enrollment.classroom_id, student_id=enrollment.student_id)
+
+
+@require_POST
+def delete_note_sync(request, note_id):
+    get_object_or_404(Note, id=note_id).delete()
+    return HttpResponse("")
+
+
+@read_only
+@cache_control(private=True, no_cache=True)
+def load_notes_for_class_sync(request, enrollment_id):
+    request._notes_validators = Note.objects.filter(enrollment_id=enrollment_id).aggregate(
+        latest=Max('updated_at'), count=Count('id'),
+    )
+    return _note_list_sync(request, enrollment_id)
+
+
+@condition(etag_func=_notes_etag, last_modified_func=_notes_last_modified)
+def _note_list_sync(request, enrollment_id):
+    if not request._notes_validators['count']:
+        get_object_or_404(Enrollment, id=enrollment_id)
+    cursor = request.GET.get('cursor')
+    notes, next_cursor = _note_page(enrollment_id, cursor)
+    return render(request, 'tracker/partials/note_list.html', {
+        'notes': notes,
+        'next_cursor': next_cursor,
+        'enrollment_id': enrollment_id,
+        'older_page': bool(cursor),
+    })
 
 from django.shortcuts import redirect, render
 from django.http import HttpResponse
@@ -227,6 +606,82 @@ def add_student_global(request):
 
 
 
+# ==================================================
+# 📥 BULK IMPORT STUDENTS (CSV / XLSX)
+# ==================================================
+IMPORT_ERRORS_SHOWN = 200
+
+
+def import_students(request):
+    """Upload a roster file and bulk-create students with their enrollments."""
+    result = None
+    if request.method == "POST":
+        form = StudentImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                result = importer.import_students(importer.read_rows(upload.file, upload.name))
+            except importer.ImportFileError as exc:
+                form.add_error('file', str(exc))
+    else:
+        form = StudentImportForm()
+
+    return render(request, 'tracker/import_students.html', {
+        'form': form,
+        'result': result,
+        'errors': result.errors[:IMPORT_ERRORS_SHOWN] if result else [],
+    })
+
+
+
+# ==================================================
+# 📤 STREAMING EXPORT (rosters & notes)
+# ==================================================
+def export_data(request, dataset, fmt):
+    """Stream every roster or note (optionally of one class) as CSV or JSON."""
+    if dataset not in EXPORT_DATASETS or fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export")
+    class_id = request.GET.get('class_id')
+    if class_id is not None and not class_id.isdigit():
+        raise Http404("Unknown class")
+
+    # Under ASGI a sync iterator would be buffered whole before sending
+    stream = astream_export if isinstance(request, ASGIRequest) else stream_export
+    content_type = 'text/csv' if fmt == 'csv' else 'application/json'
+    response = StreamingHttpResponse(
+        stream(dataset, fmt, class_id=class_id),
+        content_type=f'{content_type}; charset=utf-8',
+    )
+    suffix = f'-class-{class_id}' if class_id else ''
+    response['Content-Disposition'] = f'attachment; filename="{dataset}{suffix}.{fmt}"'
+    return response
+
+
+# ==================================================
+# 🔄 DELTA SYNC API (offline tablets)
+# ==================================================
+@require_GET
+@gzip_page
+def sync_changes(request):
+    """
+    Rows of every model changed since ``?cursor=`` plus deletions, as JSON.
+
+    Clients keep calling with the returned cursor while ``has_more`` is
+    true; ``?limit=`` sets the rows per model and page.
+    """
+    limit = request.GET.get('limit', '')
+    page_size = min(int(limit), SYNC_MAX_PAGE_SIZE) if limit.isdigit() and int(limit) > 0 else SYNC_PAGE_SIZE
+    try:
+        changes = changes_since(request.GET.get('cursor'), page_size=page_size)
+    except (InvalidCursor, ValidationError):
+        return JsonResponse({'error': "Invalid sync cursor"}, status=400)
+
+    response = JsonResponse(changes, json_dumps_params={'separators': (',', ':')})
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+
 # STUDENT EDIT
 
 from django.shortcuts import render, get_object_or_404, redirect
@@ -250,3 +705,33 @@ def edit_student(request, pk):
         'student': student,
         'next': next_url,
     })
+
+
+# ==================================================
+# 🔎 SEARCH (students & notes)
+# ==================================================
+SEARCH_RESULTS_LIMIT = 20
+
+
+def search(request):
+    """Full-text search over students and note content."""
+    query = request.GET.get('q', '').strip()
+    context = {'query': query, 'students': [], 'notes': []}
+    if query:
+        context['students'] = search_students(query, limit=SEARCH_RESULTS_LIMIT)
+        context['notes'] = search_notes(query, limit=SEARCH_RESULTS_LIMIT)
+
+    if request.headers.get("HX-Request"):
+        return render(request, 'tracker/partials/search_results.html', context)
+    return render(request, 'tracker/search.html', context)
+
+
+# ==================================================
+# ⏱ REQUEST TIMING STATS (staff only)
+# ==================================================
+@staff_member_required
+def timing_stats(request):
+    """Aggregated query count and timings per URL name since process start."""
+    if request.method == "POST" and request.POST.get("reset"):
+        timing.reset()
+    return JsonResponse({'views': timing.snapshot()})